@@ -5,6 +5,8 @@ from tkinter import *
 from tkinter import messagebox
 import tkinter
 from tkinter.ttk import Combobox
+import time
+import components
 import maze
 from palettes import Palettes
 
@@ -70,10 +72,10 @@ class AStarApp(Tk):
             rows (int): The number of rows of the grid.
             columns (int): The number of columns of the grid.
         """
-        padding = 100
+        padding = 235
         new_frame = GridWindow(self, palette, rows, columns)
-        new_heigth = (rows + 2) * new_frame.square_width + padding
-        new_width = (columns + 2) * new_frame.square_width
+        new_heigth = new_frame.view_height + 2 * new_frame.square_width + padding
+        new_width = new_frame.view_width + 2 * new_frame.square_width
         x_window = self.screen_width // 2 - new_width // 2
         y_window = self.screen_height // 2 - new_heigth // 2
         self.geometry("%dx%d+%d+%d" % (new_width, new_heigth, x_window, y_window))
@@ -147,7 +149,7 @@ class MainMenu(Frame):
             fg=FG_COLOR,
         )
 
-        value_list = [i for i in range(10, 41)]
+        value_list = [i for i in range(10, 41)] + [50, 100, 200, 500, 1000, 2000]
         height_box = Combobox(
             self,
             values=value_list,
@@ -208,14 +210,42 @@ class GridWindow(Frame):
     the user to try with multiple configurations simply by restarting the grid.
     """
 
+    # The Graph methods the user can choose from, by their displayed name. Jump Point
+    # Search explores the fewest squares but is only faster on open maps and rooms
+    ALGORITHMS = {
+        "A*": "a_star_algo",
+        "Jump Point Search": "jump_point_search",
+        "Bidirectional A*": "bidirectional_a_star_algo",
+    }
+    # The step-wise forms of those methods, see maze.Graph.a_star_steps
+    STEPPED_ALGORITHMS = {"a_star_algo": "a_star_steps"}
+    # The number of expansions shown at a time, and the delay between two steps in ms
+    STEP_SIZE = 8
+    STEP_DELAY = 15
+    # The states of a square, see cells
+    EMPTY, WALL, START, DEST, EXPLORED, PATH = range(6)
+    # The zoom levels, in pixels per square. Below 1, only one square out of
+    # 1 / scale in each direction is drawn
+    SCALES = (1 / 16, 1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 4, 5, 6, 8, 10, 12, 16, 20, 30, 40)
+    # The largest width and height of the canvas in pixels
+    MAX_VIEW_SIZE = 800
+    # The largest number of squares for which the connected areas of the grid are
+    # kept up to date as walls are drawn: cutting a grid in two costs the size of
+    # the smaller half
+    MAX_INDEXED_CELLS = 200 * 200
+    # The smallest scale at which the lines between squares are drawn
+    GRID_LINES_SCALE = 5
+    # The number of squares an arrow key moves the view by, at a scale of 1
+    PAN_STEP = 40
+
     def __init__(
         self, parent: AStarApp, palette: Palettes, rows: int, columns: int
     ) -> None:
         """Creates a grid frame for the application.
 
         Attributes:
-            square_width (int): The width of a square of the grid.
-            rect_ids (list[int]): The list of all ids of  the squares contained in the grid.
+            square_width (int): The default width of a square of the grid, and the
+            margin around the canvas.
             palette (Palettes): The color palette to apply.
             FG_COLOR (str): The value for the foreground color of the window.
             BG_COLOR (str): The value for the background color of the window.
@@ -231,7 +261,36 @@ class GridWindow(Frame):
             has_dest (bool): Determines if there is a goal square for the algorithm.
             generated (bool): Determines if the algorithm has generated a path or not.
             allow_diagonal (bool): Determines if diagonal movement is allowed by the algorithm.
+            algorithm (StringVar): The name of the search algorithm to use, see ALGORITHMS.
+            search (generator): The running search, see maze.Graph.a_star_steps.
+            search_job (str): The id of the next step of the running search.
+            stats (maze.SearchStats): The counters of the last search.
+            cells (bytearray): The state of every square (EMPTY, WALL, START, DEST,
+            EXPLORED or PATH), indexed by row * columns + column. The canvas only shows
+            the visible part of it.
+            graph (maze.ArrayGraph): The Graph of the grid, whose walls are kept in sync
+            with the squares.
+            components (dict): The components.ComponentIndex of the Graph for each
+            movement mode, by allow_diagonal. Empty for grids bigger than
+            MAX_INDEXED_CELLS.
+            step_size (int): The number of expansions shown at a time, at least
+            STEP_SIZE and more for big grids.
+            view_width (int): The width of the canvas in pixels.
+            view_height (int): The height of the canvas in pixels.
+            scale (float): The current zoom level, in pixels per square, see SCALES.
+            view_row (int): The row of the square in the top left corner of the canvas.
+            view_column (int): The column of the square in the top left corner of
+            the canvas.
+            pan_anchor (tuple[int, int]): The position of the cursor when the user
+            started dragging the view.
+            start_cell (int): The index of the starting square, -1 if there is none.
+            dest_cell (int): The index of the goal square, -1 if there is none.
             canvas (Canvas): The canvas where the grid is drawn.
+            stats_label (Label): The label showing the stats of the last search.
+            channel_tables (list[bytes]): For the red, green and blue channels, the
+            tables translating each state to the value of the channel of its color.
+            image (PhotoImage): The image of the visible squares shown by the canvas.
+            image_id (int): The id of the image in the canvas.
 
         Args:
             parent (AStarApp): The application using this frame.
@@ -240,7 +299,6 @@ class GridWindow(Frame):
             columns (int): The number of columns for the grid.
         """
         self.square_width = 20
-        self.rect_ids = []
         self.palette = palette
         self.FG_COLOR = palette.value[0]
         self.BG_COLOR = palette.value[1]
@@ -258,15 +316,54 @@ class GridWindow(Frame):
         self.generated = False
         self.allow_diagonal = BooleanVar()
         self.allow_diagonal.set(False)
+        self.algorithm = StringVar()
+        self.algorithm.set("A*")
+        self.search = None
+        self.search_job = None
+        self.stats = None
+        self.cells = bytearray(rows * columns)
+        self.graph = maze.ArrayGraph(rows, columns)
+        self.components = {}
+        self.index_components()
+        self.start_cell = -1
+        self.dest_cell = -1
+        self.step_size = max(self.STEP_SIZE, rows * columns // 500)
+        self.view_width = min(columns * self.square_width, self.MAX_VIEW_SIZE)
+        self.view_height = min(rows * self.square_width, self.MAX_VIEW_SIZE)
+        # The largest zoom level showing the whole grid, or the smallest one
+        self.scale = self.SCALES[0]
+        for scale in self.SCALES:
+            if scale <= self.square_width and (
+                columns * scale <= self.view_width and rows * scale <= self.view_height
+            ):
+                self.scale = scale
+        self.view_row = 0
+        self.view_column = 0
+        self.pan_anchor = None
 
         Frame.__init__(
             self,
             parent,
             background=self.BG_COLOR,
-            height=(rows + 2) * self.square_width,
-            width=(columns + 2) * self.square_width,
+            height=self.view_height + 2 * self.square_width,
+            width=self.view_width + 2 * self.square_width,
         )
         self.canvas = Canvas(self, bg=self.BG_COLOR, bd=0, highlightthickness=0)
+        colors = [
+            self.winfo_rgb(color)
+            for color in (
+                self.BG_COLOR,
+                self.WALL_COLOR,
+                self.START_COLOR,
+                self.DEST_COLOR,
+                self.EXPLORED_COLOR,
+                self.PATH_COLOR,
+            )
+        ]
+        self.channel_tables = [
+            bytes(color[channel] // 256 for color in colors).ljust(256, b"\0")
+            for channel in range(3)
+        ]
         gen_button = Button(
             self,
             text="Find path",
@@ -283,6 +380,29 @@ class GridWindow(Frame):
             fg=self.FG_COLOR,
             command=self.restart,
         )
+        cancel_button = Button(
+            self,
+            text="Cancel",
+            font=("Courrier", 15),
+            bg=self.BG_COLOR,
+            fg=self.FG_COLOR,
+            command=self.cancel,
+        )
+        self.stats_label = Label(
+            self,
+            text="",
+            font=("Courrier", 11),
+            bg=self.BG_COLOR,
+            fg=self.FG_COLOR,
+        )
+        algorithm_box = Combobox(
+            self,
+            values=list(self.ALGORITHMS),
+            textvariable=self.algorithm,
+            width=18,
+            state="readonly",
+            font=("Courrier", 13),
+        )
         diagonal_checkbutton = Checkbutton(
             self,
             text="Allow diagonal movement",
@@ -300,52 +420,221 @@ class GridWindow(Frame):
             pady=self.square_width,
             columnspan=3,
         )
-        self.canvas.config(
-            height=rows * self.square_width + 1, width=columns * self.square_width + 1
-        )
+        self.canvas.config(height=self.view_height + 1, width=self.view_width + 1)
         self.create_grid(rows, columns)
         self.canvas.bind("<Button-1>", self.handle_left_click)
         self.canvas.bind("<B1-Motion>", self.draw)
         self.canvas.bind("<Button-3>", self.handle_right_click)
         self.canvas.bind("<Button-2>", self.clear_grid)
+        self.canvas.bind("<Shift-Button-1>", self.start_pan)
+        self.canvas.bind("<Shift-B1-Motion>", self.drag_pan)
+        # Windows and macOS send MouseWheel events, X11 sends buttons 4 and 5
+        self.canvas.bind("<MouseWheel>", self.handle_wheel)
+        self.canvas.bind("<Button-4>", self.handle_wheel)
+        self.canvas.bind("<Button-5>", self.handle_wheel)
+        self.canvas.bind("<Enter>", lambda event: self.canvas.focus_set())
+        self.canvas.bind("<Left>", lambda event: self.pan_by_key(0, -1))
+        self.canvas.bind("<Right>", lambda event: self.pan_by_key(0, 1))
+        self.canvas.bind("<Up>", lambda event: self.pan_by_key(-1, 0))
+        self.canvas.bind("<Down>", lambda event: self.pan_by_key(1, 0))
 
         gen_button.grid(row=1, column=0, padx=10, pady=5)
         restart_button.grid(row=1, column=2, padx=10, pady=5)
         diagonal_checkbutton.grid(row=2, column=0, padx=10, pady=5, columnspan=3)
+        algorithm_box.grid(row=3, column=0, padx=10, pady=5, columnspan=3)
+        cancel_button.grid(row=4, column=0, padx=10, pady=5, columnspan=3)
+        self.stats_label.grid(row=5, column=0, padx=10, pady=5, columnspan=3)
 
     def create_grid(self, rows: int, columns: int) -> None:
-        """Creates a grid in the canvas based on the desired dimensions and adds the created
-        squares to rect_ids.
+        """Creates a grid in the canvas based on the desired dimensions. The visible
+        squares are drawn by a single image, under the lines of the grid.
 
         Args:
             rows (int): The number of rows of the grid.
             columns (int): The number of columns of the grid.
         """
-        for y in range(rows):
-            for x in range(columns):
-                x1 = x * self.square_width
-                x2 = x1 + self.square_width
-                y1 = y * self.square_width
-                y2 = y1 + self.square_width
-                self.rect_ids.append(self.canvas.create_rectangle(x1, y1, x2, y2))
-        for rect in self.rect_ids:
-            self.canvas.itemconfig(rect, fill=self.BG_COLOR)
+        self.image = None
+        self.image_id = self.canvas.create_image(0, 0, anchor=NW)
+        self.render()
+
+    def visible_squares(self) -> tuple[int, int, int]:
+        """Gets the squares shown by the canvas.
+
+        Returns:
+            tuple[int, int, int]: The row after the last visible one, the column after
+            the last visible one, and the number of squares per pixel (1 unless the
+            scale is below 1).
+        """
+        scale = self.scale
+        last_row = min(self.rows, self.view_row + int(-(-self.view_height // scale)))
+        last_column = min(
+            self.columns, self.view_column + int(-(-self.view_width // scale))
+        )
+        return last_row, last_column, max(1, round(1 / scale))
+
+    def render(self) -> None:
+        """Shows the state of the visible squares. Their states are sent to Tk at once
+        as a PPM image with one pixel per square, which is then zoomed to the size of
+        the squares. The work depends on the size of the canvas, not on the size of
+        the grid.
+        """
+        cells = self.cells
+        columns = self.columns
+        first_column = self.view_column
+        last_row, last_column, stride = self.visible_squares()
+        states = b"".join(
+            cells[first : first + last_column - first_column : stride]
+            for first in range(
+                self.view_row * columns + first_column,
+                last_row * columns,
+                stride * columns,
+            )
+        )
+        height = -(-(last_row - self.view_row) // stride)
+        width = len(states) // height
+        pixels = bytearray(3 * len(states))
+        for channel, table in enumerate(self.channel_tables):
+            pixels[channel::3] = states.translate(table)
+        header = b"P6 %d %d 255 " % (width, height)
+        image = PhotoImage(master=self, data=header + bytes(pixels), format="PPM")
+        if self.scale > 1:
+            image = image.zoom(int(self.scale))
+        self.image = image
+        self.canvas.itemconfig(self.image_id, image=image)
+        self.draw_grid_lines(width * max(1, self.scale), height * max(1, self.scale))
+
+    def draw_grid_lines(self, width: int, height: int) -> None:
+        """Draws the outline of the visible part of the grid, and the lines between
+        its squares if they are big enough.
+
+        Args:
+            width (int): The width of the visible part of the grid in pixels.
+            height (int): The height of the visible part of the grid in pixels.
+        """
+        canvas = self.canvas
+        canvas.delete("grid_lines")
+        if self.scale >= self.GRID_LINES_SCALE:
+            scale = int(self.scale)
+            for y in range(0, height + 1, scale):
+                canvas.create_line(0, y, width + 1, y, tags="grid_lines")
+            for x in range(0, width + 1, scale):
+                canvas.create_line(x, 0, x, height + 1, tags="grid_lines")
+        else:
+            canvas.create_rectangle(0, 0, width, height, tags="grid_lines")
+
+    def move_view(self, view_row: int, view_column: int) -> None:
+        """Moves the top left corner of the view to a square, without leaving the grid.
+
+        Args:
+            view_row (int): The row of the square.
+            view_column (int): The column of the square.
+        """
+        visible_rows = int(self.view_height / self.scale)
+        visible_columns = int(self.view_width / self.scale)
+        self.view_row = max(0, min(view_row, self.rows - visible_rows))
+        self.view_column = max(0, min(view_column, self.columns - visible_columns))
+
+    def pan(self, rows: int, columns: int) -> None:
+        """Moves the view by a number of squares.
+
+        Args:
+            rows (int): The number of rows to move the view down by.
+            columns (int): The number of columns to move the view right by.
+        """
+        view = (self.view_row, self.view_column)
+        self.move_view(self.view_row + rows, self.view_column + columns)
+        if (self.view_row, self.view_column) != view:
+            self.render()
+
+    def pan_by_key(self, rows: int, columns: int) -> None:
+        """Moves the view when an arrow key is pressed, by the same distance on screen
+        whatever the zoom level.
+
+        Args:
+            rows (int): The vertical direction of the arrow, -1, 0 or 1.
+            columns (int): The horizontal direction of the arrow, -1, 0 or 1.
+        """
+        step = max(1, int(self.PAN_STEP / self.scale))
+        self.pan(rows * step, columns * step)
+
+    def start_pan(self, event: Event) -> None:
+        """Starts dragging the view when the left click button is pressed with Shift.
+
+        Args:
+            event (Event): The Shift left click event.
+        """
+        self.pan_anchor = (event.x, event.y)
+
+    def drag_pan(self, event: Event) -> None:
+        """Drags the view with the cursor while the left click button is held down
+        with Shift.
+
+        Args:
+            event (Event): The Shift left click holding event.
+        """
+        if self.pan_anchor is None:
+            return
+        rows = int((self.pan_anchor[1] - event.y) / self.scale)
+        columns = int((self.pan_anchor[0] - event.x) / self.scale)
+        if rows or columns:
+            self.pan(rows, columns)
+            # Keep the remainder of the move for the next event
+            self.pan_anchor = (
+                self.pan_anchor[0] - columns * self.scale,
+                self.pan_anchor[1] - rows * self.scale,
+            )
+
+    def handle_wheel(self, event: Event) -> None:
+        """Zooms in or out of the square under the cursor when the mouse wheel turns.
+
+        Args:
+            event (Event): The mouse wheel event.
+        """
+        zoom_in = event.num == 4 or event.delta > 0
+        index = self.SCALES.index(self.scale) + (1 if zoom_in else -1)
+        if not 0 <= index < len(self.SCALES):
+            return
+        # The square under the cursor stays under the cursor
+        row = self.view_row + event.y / self.scale
+        column = self.view_column + event.x / self.scale
+        self.scale = self.SCALES[index]
+        self.move_view(
+            round(row - event.y / self.scale), round(column - event.x / self.scale)
+        )
+        self.render()
 
     def get_clicked_square(self, x: int, y: int) -> int:
-        """Gets the id of the square based on the position of the cursor when the click occured.
+        """Gets the index of the square based on the position of the cursor when the click occured.
 
         Args:
             x (int): The x-axis of the cursor when the click occured.
             y (int): The y-axis of the cursor when the click occured.
 
         Returns:
-            int: The id of the clicked square.
+            int: The index of the clicked square, -1 if the cursor is outside of the grid.
         """
-        width = self.square_width
-        if x >= 0 and y >= 0 and x < self.columns * width and y < self.rows * width:
-            return (x // width) + 1 + self.columns * (y // width)
+        if x >= 0 and y >= 0 and x < self.view_width and y < self.view_height:
+            row = self.view_row + int(y / self.scale)
+            column = self.view_column + int(x / self.scale)
+            if row < self.rows and column < self.columns:
+                return column + self.columns * row
         return -1
 
+    def set_wall(self, cell: int, is_wall: bool) -> None:
+        """Makes a square a wall or an empty square, in the grid and in the Graph.
+
+        Args:
+            cell (int): The index of the square.
+            is_wall (bool): Whether the square becomes a wall.
+        """
+        row, column = divmod(cell, self.columns)
+        if is_wall:
+            self.cells[cell] = self.WALL
+            self.graph.add_wall(row, column)
+        else:
+            self.cells[cell] = self.EMPTY
+            self.graph.remove_wall(row, column)
+
     def handle_left_click(self, event: Event) -> None:
         """Makes the square at the cursor's position a wall when a left click event
         is recognized. It will erase the wall instead if it is already a wall.
@@ -354,15 +643,17 @@ class GridWindow(Frame):
             event (Event): The left click event.
         """
         if not self.generated:
-            rect_id = self.get_clicked_square(event.x, event.y)
-            if rect_id != -1:
-                color = self.canvas.itemcget(rect_id, "fill")
-                if color == self.BG_COLOR:
-                    self.canvas.itemconfig(rect_id, fill=self.WALL_COLOR)
+            cell = self.get_clicked_square(event.x, event.y)
+            if cell != -1:
+                state = self.cells[cell]
+                if state == self.EMPTY:
+                    self.set_wall(cell, True)
                     self.erase_mode = False
-                elif color == self.WALL_COLOR:
-                    self.canvas.itemconfig(rect_id, fill=self.BG_COLOR)
+                    self.render()
+                elif state == self.WALL:
+                    self.set_wall(cell, False)
                     self.erase_mode = True
+                    self.render()
 
     def draw(self, event: Event) -> None:
         """Draws wall on all squares hovered by the cursor while the left click button is
@@ -374,15 +665,17 @@ class GridWindow(Frame):
             event (Event): The left click holding event.
         """
         if not self.generated:
-            rect_id = self.get_clicked_square(event.x, event.y)
-            if rect_id != -1:
-                color = self.canvas.itemcget(rect_id, "fill")
+            cell = self.get_clicked_square(event.x, event.y)
+            if cell != -1:
+                state = self.cells[cell]
                 if not self.erase_mode:
-                    if color == self.BG_COLOR:
-                        self.canvas.itemconfig(rect_id, fill=self.WALL_COLOR)
+                    if state == self.EMPTY:
+                        self.set_wall(cell, True)
+                        self.render()
                 else:
-                    if color != self.START_COLOR and color != self.DEST_COLOR:
-                        self.canvas.itemconfig(rect_id, fill=self.BG_COLOR)
+                    if state == self.WALL:
+                        self.set_wall(cell, False)
+                        self.render()
 
     def handle_right_click(self, event: Event) -> None:
         """Creates a starting square on the square at the cursor's position
@@ -394,22 +687,27 @@ class GridWindow(Frame):
             event (Event): The right click event.
         """
         if not self.generated:
-            rect_id = self.get_clicked_square(event.x, event.y)
-            if rect_id != -1:
-                color = self.canvas.itemcget(rect_id, "fill")
-                if color == self.BG_COLOR:
+            cell = self.get_clicked_square(event.x, event.y)
+            if cell != -1:
+                state = self.cells[cell]
+                if state == self.EMPTY:
                     if not self.has_start:
                         self.has_start = True
-                        self.canvas.itemconfig(rect_id, fill=self.START_COLOR)
+                        self.start_cell = cell
+                        self.cells[cell] = self.START
                     elif not self.has_dest:
                         self.has_dest = True
-                        self.canvas.itemconfig(rect_id, fill=self.DEST_COLOR)
-                elif color == self.START_COLOR:
-                    self.canvas.itemconfig(rect_id, fill=self.BG_COLOR)
+                        self.dest_cell = cell
+                        self.cells[cell] = self.DEST
+                elif state == self.START:
+                    self.cells[cell] = self.EMPTY
                     self.has_start = False
-                elif color == self.DEST_COLOR:
-                    self.canvas.itemconfig(rect_id, fill=self.BG_COLOR)
+                    self.start_cell = -1
+                elif state == self.DEST:
+                    self.cells[cell] = self.EMPTY
                     self.has_dest = False
+                    self.dest_cell = -1
+                self.render()
 
     def clear_grid(self, event: Event):
         """Clears the grid by removing all walls, the start and the end squares.
@@ -418,71 +716,168 @@ class GridWindow(Frame):
             event (Event): The middle mouse button event.
         """
         if not self.generated:
-            for rect in self.rect_ids:
-                self.canvas.itemconfig(rect, fill=self.BG_COLOR)
+            self.cells = bytearray(self.rows * self.columns)
+            self.graph = maze.ArrayGraph(self.rows, self.columns)
+            self.index_components()
             self.has_dest = False
             self.has_start = False
+            self.start_cell = -1
+            self.dest_cell = -1
+            self.render()
+
+    def index_components(self) -> None:
+        """Replaces the indexes of the connected areas with new ones for the Graph of
+        the grid, if it isn't bigger than MAX_INDEXED_CELLS.
+        """
+        for index in self.components.values():
+            index.close()
+        self.components = {}
+        if self.rows * self.columns <= self.MAX_INDEXED_CELLS:
+            for allow_diagonal in (True, False):
+                self.components[allow_diagonal] = components.ComponentIndex(
+                    self.graph, allow_diagonal
+                )
 
     def get_id_from_position(self, position: tuple[int, int]) -> int:
-        """Gets the rectangle id corresponding of the square at the given position.
+        """Gets the index of the square at the given position.
 
         Args:
-            position (tuple[int, int]): The position to get the square id from.
+            position (tuple[int, int]): The position to get the square index from.
 
         Returns:
-            int: The id of the square at the position.
+            int: The index of the square at the position.
         """
         row = position[0]
         column = position[1]
-        return row * self.columns + (column + 1)
+        return row * self.columns + column
 
     def convert_to_graph(self) -> maze.Graph:
-        """Converts the grid of squares to a Graph of Nodes.
+        """Gets the Graph of the grid, with the starting and goal Nodes of the grid.
+        Its walls are already those of the grid.
 
         Returns:
-            maze.Graph: The Graph obtained by converting the grid.
-        """
-        graph = maze.Graph(self.rows, self.columns)
-        for rect in self.rect_ids:
-            node_row = (rect - 1) // self.columns
-            node_column = (rect - 1) % self.columns
-            color = self.canvas.itemcget(rect, "fill")
-            if color == self.WALL_COLOR:
-                graph.add_wall(node_row, node_column)
-            elif color == self.START_COLOR:
-                graph.set_start_node(node_row, node_column)
-            elif color == self.DEST_COLOR:
-                graph.set_dest_node(node_row, node_column)
-        return graph
+            maze.Graph: The Graph of the grid.
+        """
+        columns = self.columns
+        self.graph.set_start_node(self.start_cell // columns, self.start_cell % columns)
+        self.graph.set_dest_node(self.dest_cell // columns, self.dest_cell % columns)
+        return self.graph
 
     def launch(self) -> None:
         """Uses the a star algorithm to find the shortest path between the start and destination.
-        The path will be showed in its own color and all explored squares are also shown.
+        The search runs a few steps at a time from the Tk event loop, so the explored squares
+        are shown as they are explored and the window stays responsive. The path will then be
+        showed in its own color, along with the stats of the search.
         If there is no path possible between the two Nodes, a message box appears to inform the user.
+        When the connected areas of the grid are indexed, the search is skipped if the
+        starting and goal squares are in different areas.
         """
         if not self.generated and self.has_start and self.has_dest:
             self.generated = True
-            path_color = self.PATH_COLOR
-            explored_color = self.EXPLORED_COLOR
-            self.convert_to_graph()
             graph = self.convert_to_graph()
-            path, explored = graph.a_star_algo(self.allow_diagonal.get())
-            for node in explored:
-                rect_id = self.get_id_from_position(node.position)
-                self.canvas.itemconfig(rect_id, fill=explored_color)
-            if path is not None:
-                for position in path:
-                    rect_id = self.get_id_from_position(position)
-                    self.canvas.itemconfig(rect_id, fill=path_color)
+            index = self.components.get(self.allow_diagonal.get())
+            if index is not None and not index.connected(
+                divmod(self.start_cell, self.columns),
+                divmod(self.dest_cell, self.columns),
+            ):
+                self.stats_label.config(
+                    text="Not searched, the squares aren't connected"
+                )
+                self.show_path(None)
+                return
+            method = self.ALGORITHMS[self.algorithm.get()]
+            self.stats = maze.SearchStats()
+            if method in self.STEPPED_ALGORITHMS:
+                steps = getattr(graph, self.STEPPED_ALGORITHMS[method])
+                self.search = steps(
+                    self.allow_diagonal.get(), self.step_size, stats=self.stats
+                )
+            else:
+                self.search = self.run_at_once(
+                    getattr(graph, method), self.allow_diagonal.get(), self.stats
+                )
+            self.search_step()
+
+    @staticmethod
+    def run_at_once(search, allow_diagonal: bool, stats: maze.SearchStats):
+        """Runs a search that has no step-wise form as a single step.
+        Only its expansions and its time are counted in the stats.
+
+        Args:
+            search (callable): The Graph method of the search.
+            allow_diagonal (bool): The flag that tells if diagonal movement is allowed.
+            stats (maze.SearchStats): The stats to fill.
+
+        Yields:
+            list[maze.Node]: The Nodes explored by the search.
 
+        Returns:
+            list[tuple[int, int]]: The path found by the search.
+        """
+        started = time.perf_counter()
+        path, explored = search(allow_diagonal)
+        stats.wall_time = time.perf_counter() - started
+        stats.expansions = len(explored)
+        yield explored
+        return path
+
+    def search_step(self) -> None:
+        """Runs one step of the running search, shows the squares it explored and
+        schedules the next step, or shows the path if the search is over.
+        """
+        try:
+            explored = next(self.search)
+        except StopIteration as stop:
+            self.search = None
+            self.search_job = None
+            if self.stats.pushes:
+                self.stats_label.config(text=str(self.stats))
             else:
-                alert_box = messagebox.showinfo(
-                    "No path found !", "There is no path to the destination !"
+                # Searches run at once only count their expansions and time
+                self.stats_label.config(
+                    text="%d expanded, %.1f ms in total"
+                    % (self.stats.expansions, self.stats.wall_time * 1000)
                 )
+            self.show_path(stop.value)
+            return
+        cells = self.cells
+        for node in explored:
+            cells[self.get_id_from_position(node.position)] = self.EXPLORED
+        self.render()
+        self.search_job = self.after(self.STEP_DELAY, self.search_step)
+
+    def show_path(self, path: list[tuple[int, int]]) -> None:
+        """Shows the path found by the search, or a message box if there is none.
+
+        Args:
+            path (list[tuple[int, int]]): The positions of the path, None if there is no path.
+        """
+        if path is not None:
+            cells = self.cells
+            for position in path:
+                cells[self.get_id_from_position(position)] = self.PATH
+            self.render()
+
+        else:
+            alert_box = messagebox.showinfo(
+                "No path found !", "There is no path to the destination !"
+            )
+
+    def cancel(self) -> None:
+        """Stops the running search. The squares it explored stay on the grid
+        until the grid is restarted.
+        """
+        if self.search is not None:
+            self.after_cancel(self.search_job)
+            self.search.close()
+            self.search = None
+            self.search_job = None
 
     def restart(self) -> None:
-        """Clears the grid and allows the user to start drawing again."""
+        """Stops the running search, clears the grid and allows the user to start drawing again."""
+        self.cancel()
         self.generated = False
+        self.stats_label.config(text="")
         self.clear_grid(None)
 
 
@@ -522,7 +917,8 @@ class OptionsWindow(Frame):
             text="Usage:\n"
             + "Left click: Draw/erase walls\n"
             + "Right click: Set starting square and goal square\n"
-            + "Middle click: Clear grid",
+            + "Middle click: Clear grid\n"
+            + "Wheel, arrows, Shift + left click: Zoom and move",
         )
         self.list_components.append(usage_label)
 
@@ -0,0 +1,191 @@
+# -*- encoding: utf-8 -*-
+"""Checks that the searches of maze find shortest paths, by comparing their paths
+with the distances of a plain breadth-first search on random grids.
+
+Every grid gets a random size and wall density, and one query between two random
+cells, walls included. Each search is run on a Graph and an ArrayGraph, in both
+movement modes. Its path must start and end on the query's cells, only make moves
+allowed by the movement mode on free cells, and be as long as the breadth-first
+distance. Any mismatch is printed and the script exits with status 1.
+
+Usage:
+    python3 benchmarks/check_paths.py [--grids 3000] [--seed 0]
+"""
+
+import argparse
+from collections import deque
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import maze
+
+# The Graph methods checked, which all return a (path, explored) pair and find no
+# path from or to a wall
+ALGORITHMS = ("jump_point_search", "bidirectional_a_star_algo")
+# The largest number of rows and columns of the grids
+MAX_SIZE = 24
+
+
+def breadth_first_distance(
+    occupancy: bytearray, rows: int, columns: int, start: int, dest: int, allow_diagonal
+) -> int:
+    """Counts the moves of a shortest path one cell at a time, without heuristic.
+
+    Args:
+        occupancy (bytearray): The walls of the grid, see maze.Graph.occupancy.
+        rows (int): The number of rows of the grid.
+        columns (int): The number of columns of the grid.
+        start (int): The cell id of the starting cell.
+        dest (int): The cell id of the goal cell.
+        allow_diagonal (bool): The flag that tells if diagonal movement is allowed.
+
+    Returns:
+        int: The number of moves of a shortest path, None if there is none.
+    """
+    if occupancy[start] or occupancy[dest]:
+        return None
+    offsets = maze.DIAGONAL_OFFSETS if allow_diagonal else maze.STRAIGHT_OFFSETS
+    distances = {start: 0}
+    frontier = deque([start])
+    while frontier:
+        cell = frontier.popleft()
+        if cell == dest:
+            return distances[cell]
+        row, column = divmod(cell, columns)
+        for row_offset, column_offset in offsets:
+            next_row = row + row_offset
+            next_column = column + column_offset
+            if not (0 <= next_row < rows and 0 <= next_column < columns):
+                continue
+            neighbour = next_row * columns + next_column
+            if not occupancy[neighbour] and neighbour not in distances:
+                distances[neighbour] = distances[cell] + 1
+                frontier.append(neighbour)
+    return None
+
+
+def check_path(
+    path: list, graph: maze.Graph, start: tuple, dest: tuple, allow_diagonal
+) -> str:
+    """Checks that a path joins two cells with moves allowed on a graph.
+
+    Args:
+        path (list): The (row, column) positions of the path.
+        graph (maze.Graph): The graph.
+        start (tuple): The (row, column) of the starting cell.
+        dest (tuple): The (row, column) of the goal cell.
+        allow_diagonal (bool): The flag that tells if diagonal movement is allowed.
+
+    Returns:
+        str: A description of the first problem found, None if the path is valid.
+    """
+    if path[0] != start or path[-1] != dest:
+        return "goes from %s to %s" % (path[0], path[-1])
+    for row, column in path:
+        if not graph._is_free(row, column):
+            return "crosses %s" % ((row, column),)
+    for (row, column), (next_row, next_column) in zip(path, path[1:]):
+        row_diff = abs(next_row - row)
+        column_diff = abs(next_column - column)
+        if max(row_diff, column_diff) != 1 or (
+            not allow_diagonal and row_diff and column_diff
+        ):
+            return "jumps from %s to %s" % ((row, column), (next_row, next_column))
+    return None
+
+
+def check_grid(generator: random.Random) -> list:
+    """Builds a random grid and checks every search on one random query.
+
+    Args:
+        generator (random.Random): The random generator.
+
+    Returns:
+        list[str]: A description of every mismatch.
+    """
+    rows = generator.randint(1, MAX_SIZE)
+    columns = generator.randint(1, MAX_SIZE)
+    density = generator.choice((0, 0.1, 0.2, 0.3, 0.4))
+    occupancy = bytearray(
+        1 if generator.random() < density else 0 for _ in range(rows * columns)
+    )
+    start = generator.randrange(rows * columns)
+    dest = generator.randrange(rows * columns)
+    mismatches = []
+    for graph in (maze.Graph(rows, columns), maze.ArrayGraph(rows, columns)):
+        for cell, occupied in enumerate(occupancy):
+            if occupied:
+                graph.add_wall(*divmod(cell, columns))
+        graph.set_start_node(*divmod(start, columns))
+        graph.set_dest_node(*divmod(dest, columns))
+        for allow_diagonal in (True, False):
+            expected = breadth_first_distance(
+                occupancy, rows, columns, start, dest, allow_diagonal
+            )
+            for algorithm in ALGORITHMS:
+                path, _ = getattr(graph, algorithm)(allow_diagonal)
+                length = None if path is None else len(path) - 1
+                problem = None
+                if length != expected:
+                    problem = "found %s moves instead of %s" % (length, expected)
+                elif path is not None:
+                    problem = check_path(
+                        path,
+                        graph,
+                        divmod(start, columns),
+                        divmod(dest, columns),
+                        allow_diagonal,
+                    )
+                if problem is not None:
+                    mismatches.append(
+                        "%s.%s %s on %dx%d walls=%s start=%s dest=%s: %s"
+                        % (
+                            type(graph).__name__,
+                            algorithm,
+                            "diagonal" if allow_diagonal else "straight",
+                            rows,
+                            columns,
+                            bytes(occupancy).hex(),
+                            divmod(start, columns),
+                            divmod(dest, columns),
+                            problem,
+                        )
+                    )
+    return mismatches
+
+
+def main(arguments=None) -> None:
+    """Checks the searches on random grids and exits with status 1 on a mismatch.
+
+    Args:
+        arguments (list[str], optional): The command line arguments.
+        Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(
+        description="Checks the paths of the searches of maze against a BFS."
+    )
+    parser.add_argument("--grids", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(arguments)
+
+    generator = random.Random(options.seed)
+    mismatches = []
+    for _ in range(options.grids):
+        mismatches += check_grid(generator)
+    if mismatches:
+        print("%d MISMATCHES:" % len(mismatches), file=sys.stderr)
+        for mismatch in mismatches:
+            print("  " + mismatch, file=sys.stderr)
+        sys.exit(1)
+    print(
+        "%d grids, %s: every path is a shortest path"
+        % (options.grids, ", ".join(ALGORITHMS)),
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# -*- encoding: utf-8 -*-
+"""Measures how many bytes a grid of Nodes costs per Node.
+
+It compares the original dictionary based Node (a position tuple and a per instance
+__dict__) with the slotted maze.Node, and shows what a whole Graph and an ArrayGraph
+cost per cell.
+
+Usage:
+    python3 benchmarks/node_memory.py [size]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import maze
+
+
+class LegacyNode:
+    """The Node layout used before maze.Node got __slots__."""
+
+    def __init__(self, row: int, column: int, parent: "LegacyNode" = None) -> None:
+        self.position = (row, column)
+        self.parent = parent
+        self.g = 0
+        self.h = 999
+        self.f = self.g + self.h
+
+
+def build_legacy_grid(size: int) -> list:
+    return [[LegacyNode(row, column) for column in range(size)] for row in range(size)]
+
+
+def build_slotted_grid(size: int) -> list:
+    column_values = list(range(size))
+    return [
+        [maze.Node(row, column, cell=row * size + column) for column in column_values]
+        for row in range(size)
+    ]
+
+
+def measure(builder, size: int) -> float:
+    """Measures the memory allocated by a builder, in bytes per cell.
+
+    Args:
+        builder: The function building a size x size grid.
+        size (int): The number of rows and columns of the grid.
+
+    Returns:
+        float: The number of bytes allocated per cell.
+    """
+    tracemalloc.start()
+    grid = builder(size)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del grid
+    return allocated / (size * size)
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    results = [
+        ("Legacy Node grid", measure(build_legacy_grid, size)),
+        ("Slotted Node grid", measure(build_slotted_grid, size)),
+        ("maze.Graph", measure(lambda n: maze.Graph(n, n), size)),
+        ("maze.ArrayGraph", measure(lambda n: maze.ArrayGraph(n, n), size)),
+    ]
+    print("%dx%d grid" % (size, size))
+    for name, bytes_per_cell in results:
+        print("%-20s %8.1f bytes per cell" % (name, bytes_per_cell))
+
+
+if __name__ == "__main__":
+    main()
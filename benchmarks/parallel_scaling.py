@@ -0,0 +1,76 @@
+# -*- encoding: utf-8 -*-
+"""Measures how parallel.find_paths_parallel scales with the number of workers.
+
+Usage:
+    python3 benchmarks/parallel_scaling.py [size] [queries] [max_workers]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import maze
+import parallel
+
+
+def build_workload(size: int, queries: int, density: float = 0.2, seed: int = 0):
+    """Builds a random map and random queries on it.
+
+    Args:
+        size (int): The number of rows and columns of the map.
+        queries (int): The number of (start, dest) pairs.
+        density (float, optional): The share of cells that are walls. Defaults to 0.2.
+        seed (int, optional): The seed of the random generator. Defaults to 0.
+
+    Returns:
+        tuple: The graph and the list of pairs.
+    """
+    generator = random.Random(seed)
+    occupancy = [
+        [generator.random() < density for _ in range(size)] for _ in range(size)
+    ]
+    graph = maze.ArrayGraph.from_occupancy(occupancy)
+    free_cells = [
+        (row, column)
+        for row in range(size)
+        for column in range(size)
+        if not occupancy[row][column]
+    ]
+    pairs = [
+        (generator.choice(free_cells), generator.choice(free_cells))
+        for _ in range(queries)
+    ]
+    return graph, pairs
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+    graph, pairs = build_workload(size, queries)
+    print(
+        "%dx%d map, %d queries, %d processors" % (size, size, queries, os.cpu_count())
+    )
+    reference = None
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        for _ in parallel.find_paths_parallel(
+            graph, pairs, workers=workers, chunk_size=64
+        ):
+            pass
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = elapsed
+        print(
+            "%2d workers: %7.2f s, %8.1f queries/s, speedup x%.2f"
+            % (workers, elapsed, queries / elapsed, reference / elapsed)
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
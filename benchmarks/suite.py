@@ -0,0 +1,437 @@
+# -*- encoding: utf-8 -*-
+"""Measures the searches of maze on reproducible workloads and compares the results
+with a baseline.
+
+Usage:
+    python3 benchmarks/suite.py [--profile quick|full] [--output results.json]
+    [--baseline benchmarks/baseline.json [--check-timings]] [--map-file map.map ...]
+
+Every workload is a map and a list of queries, generated from a fixed seed, for
+each movement mode. The results (expansions, explored nodes per second, p50 and
+p99 query latency, peak memory) are written as JSON. With a baseline, the metrics
+that don't depend on the machine (expansions, path length, peak memory) are compared
+with it, and any regression is reported with exit status 1. The timings are only
+compared with --check-timings, since they depend on the machine and on its load: each
+query is then run --repeat times and its median time is kept, and the baseline should
+be made on the machine it is compared on.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import headless
+import maze
+
+# The sizes of the maps and the number of queries on each map, by profile
+PROFILES = {
+    "quick": ((100, 200), 30),
+    "full": ((100, 500, 1000, 2000), 40),
+}
+# The metrics that don't depend on the machine, always compared with the baseline,
+# and how much higher than the baseline each one may be
+DETERMINISTIC_METRICS = {
+    "expansions": 0.0,
+    "path_length": 0.0,
+    "peak_memory_bytes": 0.05,
+}
+# The timings, only compared with the baseline on request, and whether higher is better
+TIMING_METRICS = {
+    "nodes_per_second": True,
+    "p50_ms": False,
+    "p99_ms": False,
+}
+
+
+def random_map(size: int, generator: random.Random, density: float) -> bytearray:
+    """Builds a map where each cell is a wall with the same probability.
+
+    Args:
+        size (int): The number of rows and columns of the map.
+        generator (random.Random): The random generator.
+        density (float): The probability of a cell being a wall.
+
+    Returns:
+        bytearray: The occupancy of the map, see maze.Graph.occupancy.
+    """
+    return bytearray(
+        1 if generator.random() < density else 0 for _ in range(size * size)
+    )
+
+
+def maze_map(size: int, generator: random.Random) -> bytearray:
+    """Builds a perfect maze with corridors one cell wide, by a depth first search.
+
+    Args:
+        size (int): The number of rows and columns of the map.
+        generator (random.Random): The random generator.
+
+    Returns:
+        bytearray: The occupancy of the map, see maze.Graph.occupancy.
+    """
+    occupancy = bytearray([1]) * (size * size)
+    occupancy[size + 1] = 0
+    stack = [(1, 1)]
+    while stack:
+        row, column = stack[-1]
+        choices = [
+            (row + row_step, column + column_step)
+            for row_step, column_step in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 < row + row_step < size - 1
+            and 0 < column + column_step < size - 1
+            and occupancy[(row + row_step) * size + column + column_step]
+        ]
+        if not choices:
+            stack.pop()
+            continue
+        next_row, next_column = generator.choice(choices)
+        occupancy[(row + next_row) // 2 * size + (column + next_column) // 2] = 0
+        occupancy[next_row * size + next_column] = 0
+        stack.append((next_row, next_column))
+    return occupancy
+
+
+def open_map(size: int, generator: random.Random) -> bytearray:
+    """Builds an open field with a few scattered rectangular obstacles.
+
+    Args:
+        size (int): The number of rows and columns of the map.
+        generator (random.Random): The random generator.
+
+    Returns:
+        bytearray: The occupancy of the map, see maze.Graph.occupancy.
+    """
+    occupancy = bytearray(size * size)
+    for _ in range(size // 10):
+        height = generator.randint(1, max(1, size // 20))
+        width = generator.randint(1, max(1, size // 20))
+        top = generator.randrange(size - height + 1)
+        left = generator.randrange(size - width + 1)
+        for row in range(top, top + height):
+            occupancy[row * size + left : row * size + left + width] = (
+                bytes([1]) * width
+            )
+    return occupancy
+
+
+def rooms_map(size: int, generator: random.Random) -> bytearray:
+    """Builds a map of square rooms joined by doors, like the room maps of the
+    MovingAI benchmarks.
+
+    Args:
+        size (int): The number of rows and columns of the map.
+        generator (random.Random): The random generator.
+
+    Returns:
+        bytearray: The occupancy of the map, see maze.Graph.occupancy.
+    """
+    room = max(8, size // 16)
+    occupancy = bytearray(size * size)
+    for line in range(room, size, room):
+        for other in range(size):
+            occupancy[line * size + other] = 1
+            occupancy[other * size + line] = 1
+    # One door in each wall between two rooms
+    for line in range(room, size, room):
+        for first in range(0, size, room):
+            door = first + generator.randrange(1, room)
+            if door < size:
+                occupancy[line * size + door] = 0
+            door = first + generator.randrange(1, room)
+            if door < size:
+                occupancy[door * size + line] = 0
+    return occupancy
+
+
+# The generators of the workloads, by name
+WORKLOADS = {
+    "random-10": lambda size, generator: random_map(size, generator, 0.1),
+    "random-30": lambda size, generator: random_map(size, generator, 0.3),
+    "maze": maze_map,
+    "open": open_map,
+    "rooms": rooms_map,
+}
+
+
+def build_queries(
+    graph: maze.Graph, count: int, generator: random.Random, allow_diagonal: bool
+) -> list:
+    """Picks queries between cells of the largest connected area of a graph, so that
+    every query has a path.
+
+    Args:
+        graph (maze.Graph): The graph.
+        count (int): The number of queries.
+        generator (random.Random): The random generator.
+        allow_diagonal (bool): The flag that tells if diagonal movement is allowed.
+
+    Returns:
+        list: The ((start_row, start_column), (dest_row, dest_column)) queries.
+    """
+    labels = graph.label_components(allow_diagonal)
+    sizes = {}
+    for label in labels:
+        if label:
+            sizes[label] = sizes.get(label, 0) + 1
+    largest = max(sizes, key=sizes.get)
+    cells = [cell for cell, label in enumerate(labels) if label == largest]
+    columns = graph.columns
+    queries = []
+    for _ in range(count):
+        start = generator.choice(cells)
+        dest = generator.choice(cells)
+        queries.append((divmod(start, columns), divmod(dest, columns)))
+    return queries
+
+
+def percentile(values: list, share: float) -> float:
+    """Gets a percentile of values with the nearest rank method.
+
+    Args:
+        values (list): The values.
+        share (float): The percentile, between 0 and 1.
+
+    Returns:
+        float: The smallest value greater than or equal to that share of the values.
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * share // 1))
+    return ordered[int(rank) - 1]
+
+
+def run_workload(
+    graph: maze.Graph, queries: list, allow_diagonal: bool, repeat: int
+) -> dict:
+    """Runs queries on a graph with Graph.a_star_algo and keeps the median time of
+    each one over a few runs, which filters out the noise of the machine. The query that
+    explored the most Nodes is run again under tracemalloc for the peak memory, since
+    the memory of a query is freed before the next one starts.
+
+    Args:
+        graph (maze.Graph): The graph.
+        queries (list): The queries, see build_queries.
+        allow_diagonal (bool): The flag that tells if diagonal movement is allowed.
+        repeat (int): The number of times each query is run.
+
+    Returns:
+        dict: The metrics of the workload.
+    """
+    latencies = []
+    expansions = 0
+    path_length = 0
+    largest = (-1, None)
+    for start, dest in queries:
+        graph.set_start_node(*start)
+        graph.set_dest_node(*dest)
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            path, explored = graph.a_star_algo(allow_diagonal)
+            times.append(time.perf_counter() - started)
+        latencies.append(statistics.median(times))
+        expansions += len(explored)
+        path_length += len(path) - 1
+        largest = max(largest, (len(explored), (start, dest)))
+    graph.set_start_node(*largest[1][0])
+    graph.set_dest_node(*largest[1][1])
+    tracemalloc.start()
+    graph.a_star_algo(allow_diagonal)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total = sum(latencies)
+    return {
+        "queries": len(queries),
+        "expansions": expansions,
+        "path_length": path_length,
+        "seconds": total,
+        "nodes_per_second": expansions / total if total else 0.0,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_suite(profile: str, engine: str, map_files: list, repeat: int = 5) -> list:
+    """Runs every workload of a profile in both movement modes.
+
+    Args:
+        profile (str): The name of the profile, see PROFILES.
+        engine (str): The name of the graph class, "Graph" or "ArrayGraph".
+        map_files (list): Paths of MovingAI map files to run as well.
+        repeat (int, optional): The number of times each query is run. Defaults to 5.
+
+    Returns:
+        list: The results, one dict per workload, size and movement mode.
+    """
+    sizes, count = PROFILES[profile]
+    graph_class = getattr(maze, engine)
+    maps = []
+    for name, build in WORKLOADS.items():
+        for size in sizes:
+            generator = random.Random(f"{name}-{size}")
+            maps.append((name, size, size, build(size, generator)))
+    for path in map_files:
+        graph = headless.read_map(path)
+        name = "movingai-" + os.path.splitext(os.path.basename(path))[0]
+        maps.append((name, graph.rows, graph.columns, graph.occupancy))
+    results = []
+    for name, rows, columns, occupancy in maps:
+        if graph_class is maze.ArrayGraph:
+            graph = maze.ArrayGraph(rows, columns, occupancy=occupancy)
+        else:
+            graph = maze.Graph(rows, columns)
+            for cell, occupied in enumerate(occupancy):
+                if occupied:
+                    graph.add_wall(*divmod(cell, columns))
+        for allow_diagonal in (True, False):
+            mode = "diagonal" if allow_diagonal else "straight"
+            generator = random.Random(f"{name}-{rows}x{columns}-{mode}")
+            queries = build_queries(graph, count, generator, allow_diagonal)
+            result = {"workload": name, "size": f"{rows}x{columns}", "mode": mode}
+            result.update(run_workload(graph, queries, allow_diagonal, repeat))
+            results.append(result)
+            print(
+                "%-12s %9s %-8s %9d expansions %10.0f nodes/s  p50 %7.2f ms  "
+                "p99 %7.2f ms  peak %7.1f kB"
+                % (
+                    name,
+                    result["size"],
+                    mode,
+                    result["expansions"],
+                    result["nodes_per_second"],
+                    result["p50_ms"],
+                    result["p99_ms"],
+                    result["peak_memory_bytes"] / 1000,
+                ),
+                file=sys.stderr,
+            )
+    return results
+
+
+def compare(
+    results: list, baseline: list, tolerance: float, check_timings: bool = False
+) -> list:
+    """Compares results with a baseline. The metrics that don't depend on the machine
+    are always compared, with the tolerances of DETERMINISTIC_METRICS.
+
+    Args:
+        results (list): The results of run_suite.
+        baseline (list): The results of an earlier run.
+        tolerance (float): How much worse than the baseline a timing may be,
+        as a fraction of the baseline.
+        check_timings (bool, optional): The flag that tells if the timings are
+        compared too. Defaults to False.
+
+    Returns:
+        list[str]: A description of every regression.
+    """
+    reference = {
+        (result["workload"], result["size"], result["mode"]): result
+        for result in baseline
+    }
+    regressions = []
+    for result in results:
+        key = (result["workload"], result["size"], result["mode"])
+        if key not in reference:
+            continue
+        checks = [
+            (metric, False, allowed)
+            for metric, allowed in DETERMINISTIC_METRICS.items()
+        ]
+        if check_timings:
+            checks += [
+                (metric, higher_is_better, tolerance)
+                for metric, higher_is_better in TIMING_METRICS.items()
+            ]
+        for metric, higher_is_better, allowed in checks:
+            old = reference[key][metric]
+            new = result[metric]
+            if higher_is_better:
+                worse = new < old * (1 - allowed)
+            else:
+                worse = new > old * (1 + allowed)
+            if worse:
+                regressions.append(
+                    "%s %s %s: %s went from %.6g to %.6g" % (*key, metric, old, new)
+                )
+    return regressions
+
+
+def main(arguments=None) -> None:
+    """Runs the suite, writes the results and compares them with the baseline.
+
+    Args:
+        arguments (list[str], optional): The command line arguments.
+        Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks the searches of maze.")
+    parser.add_argument("--profile", choices=PROFILES, default="quick")
+    parser.add_argument(
+        "--engine", choices=("ArrayGraph", "Graph"), default="ArrayGraph"
+    )
+    parser.add_argument("--map-file", action="append", default=[])
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="how many times each query is run, the median time is kept (default 5)",
+    )
+    parser.add_argument("--output", help="the file to write the results to")
+    parser.add_argument("--baseline", help="the results to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="how much worse than the baseline a timing may be (default 0.3)",
+    )
+    parser.add_argument(
+        "--check-timings",
+        action="store_true",
+        help="compare the timings with the baseline too, not only the expansions, "
+        "path lengths and peak memory",
+    )
+    options = parser.parse_args(arguments)
+
+    results = run_suite(
+        options.profile, options.engine, options.map_file, options.repeat
+    )
+    report = {
+        "profile": options.profile,
+        "engine": options.engine,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=1)
+            file.write("\n")
+    if options.baseline:
+        with open(options.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if (baseline["profile"], baseline["engine"]) != (
+            options.profile,
+            options.engine,
+        ):
+            sys.exit("The baseline was made with another profile or engine")
+        regressions = compare(
+            results, baseline["results"], options.tolerance, options.check_timings
+        )
+        if regressions:
+            print("%d REGRESSIONS:" % len(regressions), file=sys.stderr)
+            for regression in regressions:
+                print("  " + regression, file=sys.stderr)
+            sys.exit(1)
+        print("No regression against %s" % options.baseline, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
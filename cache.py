@@ -0,0 +1,138 @@
+# -*- encoding: utf-8 -*-
+"""A bounded cache of search results in front of maze.Graph.a_star_algo."""
+
+from collections import OrderedDict
+
+import maze
+
+
+class PathCache:
+    """This class remembers the last paths found on a Graph, by starting cell, goal
+    cell and movement mode, and forgets the least recently used one when it is full.
+    Every wall change bumps the version of the Graph, which empties the cache.
+
+    Any part of a shortest path is a shortest path itself, and since every move can
+    be made both ways, so is its reverse. A query whose starting and goal cells both
+    lie on a cached path is answered from that path, without searching.
+    """
+
+    def __init__(self, graph: maze.Graph, size: int = 256) -> None:
+        """Creates an empty cache for a Graph.
+
+        Attributes:
+            graph (maze.Graph): The graph whose paths are cached.
+            size (int): The maximum number of cached paths.
+            entries (OrderedDict): The cached paths, least recently used first, as
+            {(start, dest, allow_diagonal): (path, {cell: index in the path})}.
+            A path is None when there is no path.
+            paths_through (dict): The keys of the cached paths going through each
+            cell, as {(cell, allow_diagonal): {key: None}}.
+            version (int): The version of the graph the cached paths were found on.
+            hits (int): The number of queries answered from the cache.
+            subpath_hits (int): The number of those answered from a longer path.
+            misses (int): The number of queries that needed a search.
+
+        Args:
+            graph (maze.Graph): The graph to cache the paths of.
+            size (int, optional): The maximum number of cached paths.
+            Defaults to 256.
+        """
+        if size < 1:
+            raise ValueError(f"The cache size must be at least 1, got {size}")
+        self.graph = graph
+        self.size = size
+        self.entries = OrderedDict()
+        self.paths_through = {}
+        self.version = graph.version
+        self.hits = 0
+        self.subpath_hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        """Forgets every cached path. The counters are kept."""
+        self.entries.clear()
+        self.paths_through.clear()
+        self.version = self.graph.version
+
+    def a_star_algo(self, allow_diagonal=True, heuristic=None) -> list[tuple[int, int]]:
+        """Finds a path between the starting Node and the goal Node of the graph,
+        from the cache if possible. See maze.Graph.a_star_algo.
+
+        Args:
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+            heuristic (callable, optional): The heuristic used on a miss.
+            It must be admissible for the cached paths to be the shortest ones.
+            Defaults to None.
+
+        Returns:
+            list[tuple[int, int]]: The list of positions of all Nodes in the path.
+            No Node is explored when the path comes from the cache.
+        """
+        graph = self.graph
+        if graph.version != self.version:
+            self.clear()
+        columns = graph.columns
+        start = graph.start_node.row * columns + graph.start_node.column
+        dest = graph.dest_node.row * columns + graph.dest_node.column
+        key = (start, dest, allow_diagonal)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], []
+        path = self.find_subpath(start, dest, allow_diagonal)
+        if path is not None:
+            self.hits += 1
+            self.subpath_hits += 1
+            return path, []
+        self.misses += 1
+        path, explored = graph.a_star_algo(allow_diagonal, heuristic)
+        self.add(key, path)
+        return path, explored
+
+    def find_subpath(self, start: int, dest: int, allow_diagonal: bool) -> list:
+        """Looks for a cached path going through two cells.
+
+        Args:
+            start (int): The first cell.
+            dest (int): The second cell.
+            allow_diagonal (bool): The movement mode of the path.
+
+        Returns:
+            list: The positions of the part of the path between both cells,
+            from start to dest, or None if no cached path goes through both.
+        """
+        for key in self.paths_through.get((start, allow_diagonal), ()):
+            path, indexes = self.entries[key]
+            if dest in indexes:
+                self.entries.move_to_end(key)
+                first = indexes[start]
+                last = indexes[dest]
+                if first <= last:
+                    return path[first : last + 1]
+                return path[last : first + 1][::-1]
+        return None
+
+    def add(self, key: tuple, path: list) -> None:
+        """Caches a path, evicting the least recently used one if the cache is full.
+
+        Args:
+            key (tuple): The (start, dest, allow_diagonal) of the query.
+            path (list): The positions of the path, or None if there is no path.
+        """
+        if len(self.entries) >= self.size:
+            old_key, (_, old_indexes) = self.entries.popitem(last=False)
+            for cell in old_indexes:
+                paths = self.paths_through[(cell, old_key[2])]
+                del paths[old_key]
+                if not paths:
+                    del self.paths_through[(cell, old_key[2])]
+        indexes = {}
+        if path is not None:
+            columns = self.graph.columns
+            for index, (row, column) in enumerate(path):
+                cell = row * columns + column
+                indexes[cell] = index
+                self.paths_through.setdefault((cell, key[2]), {})[key] = None
+        self.entries[key] = (path, indexes)
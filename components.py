@@ -0,0 +1,178 @@
+# -*- encoding: utf-8 -*-
+"""An index of the connected areas of a maze.Graph, kept up to date as its walls
+change, to tell in constant time whether two cells can be joined.
+"""
+
+from collections import deque
+from array import array
+
+import maze
+
+
+class ComponentIndex:
+    """This class labels the connected areas of a Graph for one movement mode.
+
+    Removing a wall can only merge the areas around it: their labels are merged in a
+    union-find structure instead of being rewritten. Adding a wall can split the area
+    it was in: a search is started from each free cell around it, all at the same
+    pace, until at most one of them is still running without having met another.
+    Only the cells of the areas that got cut off get a new label, so the cost of an
+    update is the size of the smallest pieces, not the size of the map.
+    """
+
+    def __init__(self, graph: maze.Graph, allow_diagonal=True) -> None:
+        """Labels the connected areas of a Graph and starts listening to its walls.
+
+        Attributes:
+            graph (maze.Graph): The graph the index is built on.
+            allow_diagonal (bool): The movement mode of the index.
+            labels (array): The label of every cell, indexed by cell id. 0 for walls.
+            Two cells are connected if their labels have the same root.
+            parents (list): The union-find parent of every label.
+            Roots are their own parent.
+
+        Args:
+            graph (maze.Graph): The graph to index.
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+        """
+        self.graph = graph
+        self.allow_diagonal = allow_diagonal
+        self.labels = graph.label_components(allow_diagonal)
+        self.parents = list(range(max(self.labels, default=0) + 1))
+        graph.add_listener(self.on_wall_changed)
+
+    def close(self) -> None:
+        """Stops listening to the walls of the graph."""
+        self.graph.remove_listener(self.on_wall_changed)
+
+    def find(self, label: int) -> int:
+        """Gets the root of a label, compressing the path to it.
+
+        Args:
+            label (int): The label.
+
+        Returns:
+            int: The root label.
+        """
+        parents = self.parents
+        root = label
+        while parents[root] != root:
+            root = parents[root]
+        while parents[label] != root:
+            parents[label], label = root, parents[label]
+        return root
+
+    def component(self, cell: int) -> int:
+        """Gets the connected area of a cell.
+
+        Args:
+            cell (int): The cell id, row * columns + column.
+
+        Returns:
+            int: The root label of the area, 0 for walls.
+        """
+        return self.find(self.labels[cell])
+
+    def connected(self, start: tuple[int, int], dest: tuple[int, int]) -> bool:
+        """Tells if there is a path between two cells.
+
+        Args:
+            start (tuple[int, int]): The (row, column) of the first cell.
+            dest (tuple[int, int]): The (row, column) of the second cell.
+
+        Returns:
+            bool: True if both cells are free and can be joined.
+        """
+        columns = self.graph.columns
+        label = self.component(start[0] * columns + start[1])
+        return label != 0 and label == self.component(dest[0] * columns + dest[1])
+
+    def new_label(self) -> int:
+        """Creates a new root label.
+
+        Returns:
+            int: The label.
+        """
+        self.parents.append(len(self.parents))
+        return len(self.parents) - 1
+
+    def on_wall_changed(self, row: int, column: int, is_wall: bool) -> None:
+        """Updates the labels around a cell whose wall changed,
+        see maze.Graph.add_listener.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            is_wall (bool): Whether the cell is now a wall.
+        """
+        cell = row * self.graph.columns + column
+        neighbours = self.graph.neighbour_cells(cell, self.allow_diagonal)
+        if not is_wall:
+            roots = {self.component(neighbour) for neighbour in neighbours}
+            if not roots:
+                self.labels[cell] = self.new_label()
+                return
+            label = roots.pop()
+            for root in roots:
+                self.parents[root] = label
+            self.labels[cell] = label
+            return
+        self.labels[cell] = 0
+        if len(neighbours) > 1:
+            self.split(neighbours)
+
+    def split(self, origins: list[int]) -> None:
+        """Searches from the free cells around a new wall at the same pace, and gives
+        a new label to the areas that turn out to be cut off from the others.
+
+        Args:
+            origins (list[int]): The free cells around the new wall.
+        """
+        graph = self.graph
+        allow_diagonal = self.allow_diagonal
+        count = len(origins)
+        owners = {}
+        frontiers = []
+        for index, origin in enumerate(origins):
+            owners[origin] = index
+            frontiers.append(deque([origin]))
+        # Searches that met are merged in a small union-find of their own
+        groups = list(range(count))
+
+        def group_of(index: int) -> int:
+            while groups[index] != index:
+                index = groups[index]
+            return index
+
+        while True:
+            running = {group_of(index) for index in range(count) if frontiers[index]}
+            if len(running) <= 1:
+                break
+            for index in range(count):
+                frontier = frontiers[index]
+                if not frontier:
+                    continue
+                cell = frontier.popleft()
+                for neighbour in graph.neighbour_cells(cell, allow_diagonal):
+                    owner = owners.get(neighbour)
+                    if owner is None:
+                        owners[neighbour] = index
+                        frontier.append(neighbour)
+                        continue
+                    first = group_of(owner)
+                    second = group_of(index)
+                    if first != second:
+                        groups[second] = first
+        finished = {group_of(index) for index in range(count)} - running
+        if not running:
+            # Every piece was explored, one of them can keep the old label
+            finished.pop()
+        if not finished:
+            return
+        new_labels = {group: self.new_label() for group in finished}
+        labels = self.labels
+        for cell, owner in owners.items():
+            label = new_labels.get(group_of(owner))
+            if label is not None:
+                labels[cell] = label
@@ -0,0 +1,211 @@
+# -*- encoding: utf-8 -*-
+"""Runs pathfinding queries without a display, on MovingAI benchmark files.
+See https://movingai.com/benchmarks/formats.html
+
+Usage:
+    python3 headless.py scenario.scen [--map map.map] [--algorithm a_star_algo]
+    [--straight]
+
+Every query of the scenario file is solved on its map, and one JSON object is
+printed per query, on its own line, as soon as it is solved.
+"""
+
+import argparse
+from itertools import groupby
+import json
+import os
+import sys
+import time
+
+import maze
+
+# The terrain characters of a map that can be crossed, the others are walls
+PASSABLE_TERRAIN = frozenset(".GS")
+
+# The Graph methods that can be run on the queries
+ALGORITHMS = (
+    "a_star_algo",
+    "jump_point_search",
+    "bidirectional_a_star_algo",
+    "anytime_a_star_algo",
+)
+
+
+def read_map(path: str) -> maze.ArrayGraph:
+    """Loads a MovingAI map file, reading the grid one line at a time.
+
+    Args:
+        path (str): The path of the .map file.
+
+    Raises:
+        ValueError: If the file isn't a valid map file.
+
+    Returns:
+        maze.ArrayGraph: The graph of the map, with a wall on every cell
+        that can't be crossed.
+    """
+    with open(path, encoding="ascii") as file:
+        header = {}
+        for line in file:
+            line = line.strip()
+            if line == "map":
+                break
+            key, _, value = line.partition(" ")
+            header[key] = value
+        else:
+            raise ValueError(f"{path} has no 'map' line")
+        try:
+            rows = int(header["height"])
+            columns = int(header["width"])
+        except (KeyError, ValueError):
+            raise ValueError(f"{path} has no valid height and width") from None
+        occupancy = bytearray()
+        for line in file:
+            line = line.rstrip("\r\n")
+            if not line and len(occupancy) == rows * columns:
+                continue
+            if len(line) != columns:
+                raise ValueError(
+                    f"{path}: expected rows of {columns} cells, got {len(line)}"
+                )
+            occupancy.extend(0 if cell in PASSABLE_TERRAIN else 1 for cell in line)
+    if len(occupancy) != rows * columns:
+        raise ValueError(
+            f"{path}: expected {rows} rows, got {len(occupancy) // columns}"
+        )
+    return maze.ArrayGraph(rows, columns, occupancy=occupancy)
+
+
+def read_scenarios(path: str):
+    """Reads a MovingAI scenario file one line at a time.
+
+    Args:
+        path (str): The path of the .scen file.
+
+    Yields:
+        dict: For every query, the path of its map (relative to the scenario file),
+        its bucket, its start and goal (row, column) and its optimal length on an
+        octile grid.
+    """
+    with open(path, encoding="ascii") as file:
+        for line in file:
+            fields = line.split()
+            if len(fields) != 9:
+                # The version line, or an empty line
+                continue
+            bucket, map_name, _, _, start_x, start_y, dest_x, dest_y, optimal = fields
+            yield {
+                "bucket": int(bucket),
+                "map": map_name,
+                "start": (int(start_y), int(start_x)),
+                "dest": (int(dest_y), int(dest_x)),
+                "optimal_length": float(optimal),
+            }
+
+
+def run_scenarios(
+    scenarios, graph: maze.Graph, algorithm="a_star_algo", allow_diagonal=True
+):
+    """Solves queries on a graph.
+
+    Args:
+        scenarios: An iterable of queries, see read_scenarios.
+        graph (maze.Graph): The graph to solve the queries on.
+        algorithm (str, optional): The name of the Graph method to use.
+        Defaults to "a_star_algo".
+        allow_diagonal (bool, optional): The flag that tells if
+        diagonal movement is allowed. Defaults to True.
+
+    Yields:
+        dict: For every query, its bucket, start, goal and optimal length, and the
+        length of the path found (None if there is none), the number of explored
+        cells and the time the search took in seconds. Queries that start or end on
+        a wall have no path and aren't searched, whatever the algorithm.
+    """
+    search = getattr(graph, algorithm)
+    columns = graph.columns
+    for scenario in scenarios:
+        start_row, start_column = scenario["start"]
+        dest_row, dest_column = scenario["dest"]
+        if (
+            graph.occupancy[start_row * columns + start_column]
+            or graph.occupancy[dest_row * columns + dest_column]
+        ):
+            path, explored, elapsed = None, [], 0.0
+        else:
+            graph.set_start_node(start_row, start_column)
+            graph.set_dest_node(dest_row, dest_column)
+            started = time.perf_counter()
+            path, explored = search(allow_diagonal)
+            elapsed = time.perf_counter() - started
+        yield {
+            "bucket": scenario["bucket"],
+            "start": scenario["start"],
+            "dest": scenario["dest"],
+            "optimal_length": scenario["optimal_length"],
+            "length": None if path is None else len(path) - 1,
+            "expansions": len(explored),
+            "time": elapsed,
+        }
+
+
+def main(arguments=None) -> None:
+    """Runs the queries of a scenario file and prints the results as JSON lines.
+
+    Args:
+        arguments (list[str], optional): The command line arguments.
+        Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(
+        description="Runs the queries of a MovingAI scenario file."
+    )
+    parser.add_argument("scenario", help="the .scen file")
+    parser.add_argument(
+        "--map",
+        help="the .map file to use for every query, "
+        "instead of the maps named in the scenario file",
+    )
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="a_star_algo")
+    parser.add_argument(
+        "--straight", action="store_true", help="forbid diagonal movement"
+    )
+    options = parser.parse_args(arguments)
+
+    scenario_folder = os.path.dirname(options.scenario)
+
+    def map_of(scenario: dict) -> str:
+        return options.map or os.path.join(scenario_folder, scenario["map"])
+
+    graph = None
+    graph_path = None
+    try:
+        # Scenario files are sorted by map: each run of queries on the same map is
+        # solved as it is read, and only the last map is kept in memory
+        for map_path, scenarios in groupby(read_scenarios(options.scenario), map_of):
+            if map_path != graph_path:
+                graph = read_map(map_path)
+                graph_path = map_path
+            _print_results(
+                run_scenarios(scenarios, graph, options.algorithm, not options.straight)
+            )
+    except BrokenPipeError:
+        # The reader of the output stopped, like head does. Python flushes stdout
+        # again when it exits, so it is sent to devnull to exit without a traceback
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+
+
+def _print_results(results) -> None:
+    """Prints results as JSON lines, flushing after each one.
+
+    Args:
+        results: An iterable of dicts, see run_scenarios.
+    """
+    for result in results:
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,532 @@
+# -*- encoding: utf-8 -*-
+"""Hierarchical pathfinding (HPA*) over a maze.Graph.
+See https://webdocs.cs.ualberta.ca/~mmueller/ps/hpastar.pdf
+"""
+
+import heapq
+
+import maze
+
+# Border runs at least this long get two transitions, one at each end
+LONG_ENTRANCE = 6
+
+
+class HierarchicalGraph:
+    """This class splits a Graph into square clusters and keeps an abstract graph of
+    their entrances. The entrances are the cells on each side of a cluster border
+    where a path can cross it. They are linked to the entrances of the same cluster
+    by the length of the shortest path inside the cluster, and to the entrance
+    facing them across the border by one step.
+
+    Queries are answered on the abstract graph. Only the first segment (from the
+    starting cell to an entrance of its cluster) and the last one (from an entrance
+    to the goal cell) are searched at full resolution, the paths between entrances
+    are cached. The paths are close to the shortest ones but not always the shortest.
+
+    The hierarchy listens to the walls of the Graph: when a wall changes, only its
+    cluster and the clusters sharing a border with it are rebuilt, before the next
+    query.
+    """
+
+    def __init__(
+        self, graph: maze.Graph, cluster_size: int = 10, allow_diagonal=True
+    ) -> None:
+        """Builds the clusters and the abstract graph of a Graph.
+
+        Attributes:
+            graph (maze.Graph): The graph the hierarchy is built on.
+            cluster_size (int): The number of rows and columns of a cluster.
+            allow_diagonal (bool): The movement mode of the hierarchy.
+            cluster_rows (int): The number of rows of clusters.
+            cluster_columns (int): The number of columns of clusters.
+            transitions (dict): The (cell, cell) pairs crossing each border,
+            by border, see HierarchicalGraph._border_cells.
+            partners (dict): The entrances facing each entrance across a border.
+            intra_costs (dict): For each cluster, the length of the shortest path
+            between each pair of its entrances, as {entrance: {entrance: cost}}.
+            intra_paths (dict): For each cluster, the cells of those shortest paths,
+            as {(entrance, entrance): list of cells}.
+            dirty (set): The clusters whose walls changed since they were built.
+
+        Args:
+            graph (maze.Graph): The graph to build the hierarchy on.
+            cluster_size (int, optional): The number of rows and columns of a cluster.
+            Defaults to 10.
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+        """
+        self.graph = graph
+        self.cluster_size = cluster_size
+        self.allow_diagonal = allow_diagonal
+        self.cluster_rows = -(-graph.rows // cluster_size)
+        self.cluster_columns = -(-graph.columns // cluster_size)
+        self.transitions = {}
+        self.partners = {}
+        self.intra_costs = {}
+        self.intra_paths = {}
+        self.dirty = set()
+        for cluster_row in range(self.cluster_rows):
+            for cluster_column in range(self.cluster_columns):
+                for border in self._borders_of(cluster_row, cluster_column):
+                    if border not in self.transitions:
+                        self._build_border(border)
+        for cluster_row in range(self.cluster_rows):
+            for cluster_column in range(self.cluster_columns):
+                self._build_cluster((cluster_row, cluster_column))
+        graph.add_listener(self.on_wall_changed)
+
+    def close(self) -> None:
+        """Stops listening to the walls of the graph."""
+        self.graph.remove_listener(self.on_wall_changed)
+
+    def cluster_of(self, cell: int) -> tuple[int, int]:
+        """Gets the cluster containing a cell.
+
+        Args:
+            cell (int): The id of the cell.
+
+        Returns:
+            tuple[int, int]: The (row, column) of the cluster.
+        """
+        columns = self.graph.columns
+        return (
+            cell // columns // self.cluster_size,
+            cell % columns // self.cluster_size,
+        )
+
+    def on_wall_changed(self, row: int, column: int, is_wall: bool) -> None:
+        """Marks the cluster of a changed cell so it is rebuilt before the next query.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            is_wall (bool): True if the cell is now a wall.
+        """
+        self.dirty.add((row // self.cluster_size, column // self.cluster_size))
+
+    def refresh(self) -> None:
+        """Rebuilds the clusters whose walls changed, the borders around them and
+        the clusters on the other side of those borders.
+        """
+        if not self.dirty:
+            return
+        to_rebuild = set()
+        for cluster in self.dirty:
+            to_rebuild.add(cluster)
+            for border in self._borders_of(*cluster):
+                self._build_border(border)
+                to_rebuild.update(self._clusters_of_border(border))
+        self.dirty = set()
+        for cluster in to_rebuild:
+            self._build_cluster(cluster)
+
+    def _borders_of(self, cluster_row: int, cluster_column: int) -> list[tuple]:
+        """Gets the borders of a cluster. A border is ("h", row, column) between the
+        cluster (row, column) and the one to its right, or ("v", row, column) between
+        the cluster (row, column) and the one under it. With diagonal movement, the
+        corners are borders too: ("d", row, column) between the cluster (row, column)
+        and the one under its right neighbour, and ("a", row, column) between the
+        cluster (row, column + 1) and the one under its left neighbour.
+
+        Args:
+            cluster_row (int): The row of the cluster.
+            cluster_column (int): The column of the cluster.
+
+        Returns:
+            list[tuple]: The borders of the cluster.
+        """
+        last_row = self.cluster_rows - 1
+        last_column = self.cluster_columns - 1
+        borders = []
+        if cluster_column > 0:
+            borders.append(("h", cluster_row, cluster_column - 1))
+        if cluster_column < last_column:
+            borders.append(("h", cluster_row, cluster_column))
+        if cluster_row > 0:
+            borders.append(("v", cluster_row - 1, cluster_column))
+        if cluster_row < last_row:
+            borders.append(("v", cluster_row, cluster_column))
+        if self.allow_diagonal:
+            if cluster_row > 0 and cluster_column > 0:
+                borders.append(("d", cluster_row - 1, cluster_column - 1))
+            if cluster_row < last_row and cluster_column < last_column:
+                borders.append(("d", cluster_row, cluster_column))
+            if cluster_row < last_row and cluster_column > 0:
+                borders.append(("a", cluster_row, cluster_column - 1))
+            if cluster_row > 0 and cluster_column < last_column:
+                borders.append(("a", cluster_row - 1, cluster_column))
+        return borders
+
+    @staticmethod
+    def _clusters_of_border(border: tuple) -> tuple:
+        """Gets the two clusters separated by a border.
+
+        Args:
+            border (tuple): The border, see HierarchicalGraph._borders_of.
+
+        Returns:
+            tuple: The (row, column) of both clusters.
+        """
+        direction, cluster_row, cluster_column = border
+        if direction == "h":
+            return (cluster_row, cluster_column), (cluster_row, cluster_column + 1)
+        if direction == "v":
+            return (cluster_row, cluster_column), (cluster_row + 1, cluster_column)
+        if direction == "d":
+            return (cluster_row, cluster_column), (cluster_row + 1, cluster_column + 1)
+        return (cluster_row, cluster_column + 1), (cluster_row + 1, cluster_column)
+
+    def _border_cells(self, border: tuple) -> tuple[list, list]:
+        """Gets the pairs of cells on each side of a border that are one step apart.
+
+        Args:
+            border (tuple): The border, see HierarchicalGraph._borders_of.
+
+        Returns:
+            tuple[list, list]: The (cell, cell) pairs facing each other, in order along
+            the border, and the (cell, cell) pairs only joined by a diagonal step.
+        """
+        graph = self.graph
+        columns = graph.columns
+        size = self.cluster_size
+        direction, cluster_row, cluster_column = border
+        if direction == "d":
+            row = (cluster_row + 1) * size - 1
+            column = (cluster_column + 1) * size - 1
+            return [], [(row * columns + column, (row + 1) * columns + column + 1)]
+        if direction == "a":
+            row = (cluster_row + 1) * size - 1
+            column = (cluster_column + 1) * size
+            return [], [(row * columns + column, (row + 1) * columns + column - 1)]
+        if direction == "h":
+            column = (cluster_column + 1) * size - 1
+            first = cluster_row * size
+            last = min(first + size, graph.rows)
+            positions = [(row, column) for row in range(first, last)]
+            across = (0, 1)
+            along = (1, 0)
+        else:
+            row = (cluster_row + 1) * size - 1
+            first = cluster_column * size
+            last = min(first + size, columns)
+            positions = [(row, column) for column in range(first, last)]
+            across = (1, 0)
+            along = (0, 1)
+        facing = [
+            (row * columns + column, (row + across[0]) * columns + column + across[1])
+            for row, column in positions
+        ]
+        diagonal = []
+        if self.allow_diagonal:
+            for index in range(len(positions) - 1):
+                row, column = positions[index]
+                next_row = row + along[0]
+                next_column = column + along[1]
+                diagonal.append(
+                    (
+                        row * columns + column,
+                        (next_row + across[0]) * columns + next_column + across[1],
+                    )
+                )
+                diagonal.append(
+                    (
+                        next_row * columns + next_column,
+                        (row + across[0]) * columns + column + across[1],
+                    )
+                )
+        return facing, diagonal
+
+    def _build_border(self, border: tuple) -> None:
+        """Finds the transitions of a border: each run of facing free cells gets one
+        transition in its middle, or one at each end if it is long. With diagonal
+        movement, a diagonal crossing is also a transition when the facing pairs on
+        both of its sides are blocked, since nothing else joins its two cells.
+
+        Args:
+            border (tuple): The border, see HierarchicalGraph._borders_of.
+        """
+        occupancy = self.graph.occupancy
+        for first, second in self.transitions.get(border, ()):
+            self.partners[first].remove(second)
+            self.partners[second].remove(first)
+        facing, diagonal = self._border_cells(border)
+        open_facing = [
+            not occupancy[first] and not occupancy[second] for first, second in facing
+        ]
+        transitions = []
+        run = []
+        for index, pair in enumerate(facing + [None]):
+            if pair is not None and open_facing[index]:
+                run.append(pair)
+                continue
+            if len(run) >= LONG_ENTRANCE:
+                transitions.append(run[0])
+                transitions.append(run[-1])
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        for index, (first, second) in enumerate(diagonal):
+            if occupancy[first] or occupancy[second]:
+                continue
+            # Diagonal pairs of a side border come by two around facing pairs i, i + 1
+            if facing and (open_facing[index // 2] or open_facing[index // 2 + 1]):
+                continue
+            transitions.append((first, second))
+        self.transitions[border] = transitions
+        for first, second in transitions:
+            self.partners.setdefault(first, []).append(second)
+            self.partners.setdefault(second, []).append(first)
+
+    def _entrances_of(self, cluster: tuple[int, int]) -> list[int]:
+        """Gets the entrances of a cluster from the transitions of its borders.
+
+        Args:
+            cluster (tuple[int, int]): The (row, column) of the cluster.
+
+        Returns:
+            list[int]: The cell ids of the entrances.
+        """
+        entrances = []
+        for border in self._borders_of(*cluster):
+            for pair in self.transitions[border]:
+                for cell in pair:
+                    if self.cluster_of(cell) == cluster and cell not in entrances:
+                        entrances.append(cell)
+        return entrances
+
+    def _build_cluster(self, cluster: tuple[int, int]) -> None:
+        """Computes the shortest paths inside a cluster between all its entrances.
+
+        Args:
+            cluster (tuple[int, int]): The (row, column) of the cluster.
+        """
+        entrances = self._entrances_of(cluster)
+        costs = {}
+        paths = {}
+        for index, entrance in enumerate(entrances):
+            costs.setdefault(entrance, {})
+            distances, parents = self.search_cluster(entrance, cluster)
+            for other in entrances[index + 1 :]:
+                if other not in distances:
+                    continue
+                costs[entrance][other] = distances[other]
+                costs.setdefault(other, {})[entrance] = distances[other]
+                path = [other]
+                while path[-1] != entrance:
+                    path.append(parents[path[-1]])
+                paths[(other, entrance)] = path
+                paths[(entrance, other)] = path[::-1]
+        self.intra_costs[cluster] = costs
+        self.intra_paths[cluster] = paths
+
+    def search_cluster(self, origin: int, cluster: tuple[int, int]) -> tuple:
+        """Runs a breadth first search from a cell without leaving its cluster.
+
+        Args:
+            origin (int): The id of the cell to search from.
+            cluster (tuple[int, int]): The (row, column) of the cluster.
+
+        Returns:
+            tuple: (distances, parents), the dicts of the number of steps from the
+            origin and of the previous cell, for every cell reached.
+        """
+        graph = self.graph
+        columns = graph.columns
+        size = self.cluster_size
+        first_row = cluster[0] * size
+        first_column = cluster[1] * size
+        last_row = min(first_row + size, graph.rows)
+        last_column = min(first_column + size, columns)
+        offsets = (
+            maze.DIAGONAL_OFFSETS if self.allow_diagonal else maze.STRAIGHT_OFFSETS
+        )
+        occupancy = graph.occupancy
+        distances = {origin: 0}
+        parents = {origin: -1}
+        frontier = [origin]
+        while frontier:
+            next_frontier = []
+            for cell in frontier:
+                row = cell // columns
+                column = cell - row * columns
+                for row_offset, column_offset in offsets:
+                    neighbour_row = row + row_offset
+                    neighbour_column = column + column_offset
+                    if not (
+                        first_row <= neighbour_row < last_row
+                        and first_column <= neighbour_column < last_column
+                    ):
+                        continue
+                    neighbour = neighbour_row * columns + neighbour_column
+                    if occupancy[neighbour] or neighbour in distances:
+                        continue
+                    distances[neighbour] = distances[cell] + 1
+                    parents[neighbour] = cell
+                    next_frontier.append(neighbour)
+            frontier = next_frontier
+        return distances, parents
+
+    def a_star_algo(self) -> list[tuple[int, int]]:
+        """Finds a path between the starting Node and the goal Node of the graph with
+        an a star search on the abstract graph.
+
+        Returns:
+            list[tuple[int, int]]: The list of positions of all Nodes in the path.
+            The explored Nodes are the entrances expanded by the abstract search.
+        """
+        self.refresh()
+        graph = self.graph
+        columns = graph.columns
+        start = graph.start_node.row * columns + graph.start_node.column
+        dest = graph.dest_node.row * columns + graph.dest_node.column
+        if graph.occupancy[start] or graph.occupancy[dest]:
+            return None, []
+        dest_row = graph.dest_node.row
+        dest_column = graph.dest_node.column
+        start_cluster = self.cluster_of(start)
+        dest_cluster = self.cluster_of(dest)
+        # First and last segments, searched at full resolution
+        start_distances, start_parents = self.search_cluster(start, start_cluster)
+        dest_distances, dest_parents = self.search_cluster(dest, dest_cluster)
+        dest_entrances = {
+            entrance: dest_distances[entrance]
+            for entrance in self._entrances_of(dest_cluster)
+            if entrance in dest_distances
+        }
+
+        direct_path = None
+        if start_cluster == dest_cluster and dest in start_distances:
+            direct_path = self._follow(start_parents, dest)[::-1]
+
+        g_scores = {start: 0}
+        parents = {start: -1}
+        closed = set()
+        explored = []
+        counter = 0
+        to_explore = [(0, 0, counter, start)]
+        while to_explore:
+            _, neg_g, _, cell = heapq.heappop(to_explore)
+            if cell in closed or -neg_g != g_scores[cell]:
+                continue
+            closed.add(cell)
+            explored.append(graph.get_node(cell // columns, cell % columns))
+            if cell == dest:
+                break
+            if direct_path is not None and -neg_g >= len(direct_path) - 1:
+                # Nothing left in the abstract graph can beat the direct path
+                break
+            for neighbour, cost in self._abstract_neighbours(
+                cell, start, start_cluster, start_distances, dest, dest_entrances
+            ):
+                new_g = -neg_g + cost
+                if neighbour in closed or new_g >= g_scores.get(neighbour, new_g + 1):
+                    continue
+                g_scores[neighbour] = new_g
+                parents[neighbour] = cell
+                row_diff = abs(neighbour // columns - dest_row)
+                column_diff = abs(neighbour % columns - dest_column)
+                if self.allow_diagonal:
+                    h = row_diff if row_diff > column_diff else column_diff
+                else:
+                    h = row_diff + column_diff
+                counter += 1
+                heapq.heappush(to_explore, (new_g + h, -new_g, counter, neighbour))
+
+        abstract_path = None
+        if dest in closed:
+            abstract_path = [dest]
+            while parents[abstract_path[-1]] != -1:
+                abstract_path.append(parents[abstract_path[-1]])
+            abstract_path.reverse()
+        if abstract_path is None or (
+            direct_path is not None and len(direct_path) - 1 <= g_scores[dest]
+        ):
+            if direct_path is None:
+                return None, explored
+            return [(cell // columns, cell % columns) for cell in direct_path], explored
+        path = self._refine(abstract_path, start_parents, dest_parents)
+        return [(cell // columns, cell % columns) for cell in path], explored
+
+    def _abstract_neighbours(
+        self,
+        cell: int,
+        start: int,
+        start_cluster: tuple[int, int],
+        start_distances: dict,
+        dest: int,
+        dest_entrances: dict,
+    ) -> list[tuple[int, int]]:
+        """Gets the neighbours of a cell in the abstract graph of a query.
+
+        Args:
+            cell (int): The id of the starting cell or of an entrance.
+            start (int): The id of the starting cell.
+            start_cluster (tuple[int, int]): The cluster of the starting cell.
+            start_distances (dict): The distances from the starting cell inside
+            its cluster.
+            dest (int): The id of the goal cell.
+            dest_entrances (dict): The distances from the entrances of the goal
+            cluster to the goal cell.
+
+        Returns:
+            list[tuple[int, int]]: The (neighbour, cost) pairs.
+        """
+        if cell == start:
+            neighbours = [
+                (entrance, start_distances[entrance])
+                for entrance in self._entrances_of(start_cluster)
+                if entrance in start_distances and entrance != start
+            ]
+            neighbours.extend((partner, 1) for partner in self.partners.get(cell, ()))
+        else:
+            cluster = self.cluster_of(cell)
+            neighbours = list(self.intra_costs[cluster].get(cell, {}).items())
+            neighbours.extend((partner, 1) for partner in self.partners.get(cell, ()))
+        if cell in dest_entrances:
+            neighbours.append((dest, dest_entrances[cell]))
+        return neighbours
+
+    def _refine(self, abstract_path: list[int], start_parents, dest_parents) -> list:
+        """Turns a path of the abstract graph into a path of cells.
+
+        Args:
+            abstract_path (list[int]): The starting cell, the entrances and the goal cell.
+            start_parents (dict): The parents of the search from the starting cell.
+            dest_parents (dict): The parents of the search from the goal cell.
+
+        Returns:
+            list[int]: The ids of all cells of the path.
+        """
+        start = abstract_path[0]
+        dest = abstract_path[-1]
+        path = [start]
+        for index in range(1, len(abstract_path)):
+            previous = abstract_path[index - 1]
+            cell = abstract_path[index]
+            if self.cluster_of(cell) != self.cluster_of(previous):
+                # Crossing a border between two facing entrances
+                segment = [previous, cell]
+            elif previous == start:
+                segment = self._follow(start_parents, cell)[::-1]
+            elif cell == dest:
+                segment = self._follow(dest_parents, previous)
+            else:
+                segment = self.intra_paths[self.cluster_of(cell)][(previous, cell)]
+            path.extend(segment[1:])
+        return path
+
+    @staticmethod
+    def _follow(parents: dict, cell: int) -> list[int]:
+        """Follows the parents of a breadth first search from a cell to its origin.
+
+        Args:
+            parents (dict): The parents of the search.
+            cell (int): The id of the cell to start from.
+
+        Returns:
+            list[int]: The cells from the given one to the origin of the search.
+        """
+        path = [cell]
+        while parents[path[-1]] != -1:
+            path.append(parents[path[-1]])
+        return path
@@ -0,0 +1,253 @@
+# -*- encoding: utf-8 -*-
+"""Incremental replanning (D* Lite) over a maze.Graph.
+See http://idm-lab.org/bib/abstracts/papers/aaai02b.pdf
+"""
+
+import heapq
+
+import maze
+
+INFINITY = float("inf")
+
+
+class DStarLite:
+    """This class keeps the state of a search between two queries on the same
+    Graph. The search goes backward, from the goal Node to the starting Node, so
+    the distance to the goal of every cell it settled stays valid when the starting
+    Node moves along the path.
+
+    The planner listens to the walls of the Graph: adding or removing a wall only
+    queues its cell, and the next query repairs the distances the change made wrong
+    instead of searching again from scratch. Changing the goal Node starts a new
+    search.
+    """
+
+    def __init__(self, graph: maze.Graph, allow_diagonal=True) -> None:
+        """Creates a planner for a Graph.
+
+        Attributes:
+            graph (maze.Graph): The graph the planner searches.
+            allow_diagonal (bool): The movement mode of the planner.
+            g_scores (dict): The settled distance to the goal of each cell.
+            rhs_scores (dict): The distance to the goal of each cell given the
+            distances of its neighbours. A cell is consistent when both are equal.
+            to_explore (list): The heap of inconsistent cells, as (key, cell) tuples.
+            It may hold outdated entries, see DStarLite.keys.
+            keys (dict): The current key of each cell in the heap.
+            key_modifier (int): The sum of the moves of the starting Node since the
+            search began, added to the keys instead of updating the whole heap.
+            changed (set): The cells whose walls changed since the last query.
+            start (int): The cell of the starting Node at the last query.
+            dest (int): The cell of the goal Node of the search, -1 before the first
+            query.
+            expansions (int): The number of cells expanded by the last query.
+
+        Args:
+            graph (maze.Graph): The graph to plan on.
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+        """
+        self.graph = graph
+        self.allow_diagonal = allow_diagonal
+        self.g_scores = {}
+        self.rhs_scores = {}
+        self.to_explore = []
+        self.keys = {}
+        self.key_modifier = 0
+        self.changed = set()
+        self.start = -1
+        self.dest = -1
+        self.expansions = 0
+        graph.add_listener(self.on_wall_changed)
+
+    def close(self) -> None:
+        """Stops listening to the walls of the graph."""
+        self.graph.remove_listener(self.on_wall_changed)
+
+    def on_wall_changed(self, row: int, column: int, is_wall: bool) -> None:
+        """Queues a cell whose wall changed, see maze.Graph.add_listener.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            is_wall (bool): Whether the cell is now a wall.
+        """
+        self.changed.add(row * self.graph.columns + column)
+
+    def distance(self, first: int, second: int) -> int:
+        """Gets the heuristic distance between two cells.
+
+        Args:
+            first (int): The first cell.
+            second (int): The second cell.
+
+        Returns:
+            int: The Chebyshev distance with diagonal movement,
+            the Manhattan distance without.
+        """
+        columns = self.graph.columns
+        row_diff = abs(first // columns - second // columns)
+        column_diff = abs(first % columns - second % columns)
+        if self.allow_diagonal:
+            return max(row_diff, column_diff)
+        return row_diff + column_diff
+
+    def reset(self, dest: int) -> None:
+        """Drops the state of the search and starts a new one toward a goal cell.
+
+        Args:
+            dest (int): The cell of the goal Node.
+        """
+        self.g_scores = {}
+        self.rhs_scores = {dest: 0}
+        self.keys = {}
+        self.to_explore = []
+        self.key_modifier = 0
+        self.changed = set()
+        self.dest = dest
+        self.push(dest)
+
+    def key(self, cell: int) -> tuple:
+        """Computes the priority of a cell in the heap.
+
+        Args:
+            cell (int): The cell.
+
+        Returns:
+            tuple: The (estimated cost through the cell, distance to the goal) key.
+        """
+        score = min(
+            self.g_scores.get(cell, INFINITY), self.rhs_scores.get(cell, INFINITY)
+        )
+        return (score + self.distance(self.start, cell) + self.key_modifier, score)
+
+    def push(self, cell: int) -> None:
+        """Adds a cell to the heap, or updates its key.
+
+        Args:
+            cell (int): The cell.
+        """
+        key = self.key(cell)
+        self.keys[cell] = key
+        heapq.heappush(self.to_explore, (key, cell))
+
+    def update_cell(self, cell: int) -> None:
+        """Recomputes the rhs score of a cell from its neighbours and puts it in the
+        heap if it is inconsistent, or takes it out of the heap otherwise.
+
+        Args:
+            cell (int): The cell.
+        """
+        if cell != self.dest:
+            rhs = INFINITY
+            if not self.graph.occupancy[cell]:
+                g_scores = self.g_scores
+                for neighbour in self.graph.neighbour_cells(cell, self.allow_diagonal):
+                    score = g_scores.get(neighbour, INFINITY) + 1
+                    if score < rhs:
+                        rhs = score
+            self.rhs_scores[cell] = rhs
+        if self.g_scores.get(cell, INFINITY) != self.rhs_scores.get(cell, INFINITY):
+            self.push(cell)
+        else:
+            self.keys.pop(cell, None)
+
+    def update_neighbours(self, cell: int) -> None:
+        """Updates the free neighbours of a cell, whose rhs scores may depend on it.
+
+        Args:
+            cell (int): The cell.
+        """
+        for neighbour in self.graph.neighbour_cells(cell, self.allow_diagonal):
+            self.update_cell(neighbour)
+
+    def compute_shortest_path(self) -> list[maze.Node]:
+        """Expands the inconsistent cells until the distance to the goal of the
+        starting cell is settled.
+
+        Returns:
+            list[maze.Node]: The expanded Nodes.
+        """
+        graph = self.graph
+        columns = graph.columns
+        start = self.start
+        g_scores = self.g_scores
+        rhs_scores = self.rhs_scores
+        keys = self.keys
+        to_explore = self.to_explore
+        explored = []
+        while to_explore:
+            key, cell = to_explore[0]
+            if keys.get(cell) != key:
+                # Outdated entry, the cell was updated or taken out since
+                heapq.heappop(to_explore)
+                continue
+            start_rhs = rhs_scores.get(start, INFINITY)
+            if key >= self.key(start) and g_scores.get(start, INFINITY) == start_rhs:
+                break
+            heapq.heappop(to_explore)
+            new_key = self.key(cell)
+            if key < new_key:
+                # The starting cell moved since this key was computed
+                keys[cell] = new_key
+                heapq.heappush(to_explore, (new_key, cell))
+                continue
+            del keys[cell]
+            explored.append(graph.get_node(cell // columns, cell % columns))
+            if g_scores.get(cell, INFINITY) > rhs_scores[cell]:
+                g_scores[cell] = rhs_scores[cell]
+            else:
+                g_scores[cell] = INFINITY
+                self.update_cell(cell)
+            self.update_neighbours(cell)
+        return explored
+
+    def plan(self) -> list[tuple[int, int]]:
+        """Finds a path between the starting Node and the goal Node of the graph,
+        reusing the previous search as much as possible.
+
+        Returns:
+            list[tuple[int, int]]: The list of positions of all Nodes in the path.
+            The explored Nodes are the ones expanded by this query.
+        """
+        graph = self.graph
+        columns = graph.columns
+        start = graph.start_node.row * columns + graph.start_node.column
+        dest = graph.dest_node.row * columns + graph.dest_node.column
+        if dest != self.dest:
+            self.start = start
+            self.reset(dest)
+        elif start != self.start:
+            self.key_modifier += self.distance(self.start, start)
+            self.start = start
+        for cell in self.changed:
+            self.update_cell(cell)
+            self.update_neighbours(cell)
+        self.changed = set()
+        explored = self.compute_shortest_path()
+        self.expansions = len(explored)
+        if graph.occupancy[start] or graph.occupancy[dest]:
+            return None, explored
+        if self.g_scores.get(start, INFINITY) == INFINITY:
+            return None, explored
+        return self.follow(start), explored
+
+    def follow(self, cell: int) -> list[tuple[int, int]]:
+        """Walks down the distances to the goal from a cell.
+
+        Args:
+            cell (int): The cell to start from.
+
+        Returns:
+            list[tuple[int, int]]: The positions of the cells up to the goal.
+        """
+        columns = self.graph.columns
+        g_scores = self.g_scores
+        path = [(cell // columns, cell % columns)]
+        while cell != self.dest:
+            cell = min(
+                self.graph.neighbour_cells(cell, self.allow_diagonal),
+                key=lambda neighbour: g_scores.get(neighbour, INFINITY),
+            )
+            path.append((cell // columns, cell % columns))
+        return path
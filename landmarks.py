@@ -0,0 +1,206 @@
+# -*- encoding: utf-8 -*-
+"""Landmark distance tables giving tighter heuristics than Manhattan or Chebyshev
+distances (the ALT technique: A*, Landmarks and the Triangle inequality).
+See https://www.microsoft.com/en-us/research/publication/computing-the-shortest-path-a-search-meets-graph-theory/
+"""
+
+from array import array
+import json
+import zlib
+
+import maze
+
+
+class LandmarkIndex:
+    """This class stores the exact distances from a few landmark cells to every cell
+    of a Graph. For any landmark L, the triangle inequality gives
+    distance(cell, dest) >= |distance(L, dest) - distance(L, cell)|,
+    which is a consistent heuristic for Graph.a_star_algo.
+
+    Adding walls to the Graph afterwards keeps the heuristic admissible, since
+    distances can only grow. Removing walls doesn't: the index must be rebuilt.
+    """
+
+    def __init__(self, graph: maze.Graph, count: int = 8, allow_diagonal=True) -> None:
+        """Picks the landmarks of a Graph and computes their distance tables.
+
+        The landmarks are picked one after the other as far as possible from the
+        ones already picked, which spreads them on the edges of the map. A cell that
+        no landmark can reach counts as infinitely far, so every separate area of
+        the map gets a landmark before any area gets a second one.
+
+        Attributes:
+            rows (int): The number of rows of the graph.
+            columns (int): The number of columns of the graph.
+            allow_diagonal (bool): The movement mode the distances were computed for.
+            checksum (int): The CRC32 of the graph's occupancy when it was indexed.
+            landmarks (list[int]): The cell ids of the landmarks.
+            tables (list[array]): The distances from each landmark to every cell,
+            indexed by cell id, -1 for cells it can't reach.
+
+        Args:
+            graph (maze.Graph): The graph to index.
+            count (int, optional): The number of landmarks. Defaults to 8.
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+        """
+        self.rows = graph.rows
+        self.columns = graph.columns
+        self.allow_diagonal = allow_diagonal
+        self.checksum = zlib.crc32(graph.occupancy)
+        self.landmarks = []
+        self.tables = []
+        self._dest = -1
+        self._dest_distances = ()
+
+        occupancy = graph.occupancy
+        free_cells = [cell for cell, occupied in enumerate(occupancy) if not occupied]
+        if not free_cells:
+            return
+        # Distance from every cell to the closest landmark picked so far
+        closest = array("i", [-1]) * len(occupancy)
+        # The first table only serves to find a cell on the edge of the map
+        candidate = self._farthest(
+            graph.distance_map(
+                free_cells[0] // self.columns,
+                free_cells[0] % self.columns,
+                allow_diagonal,
+            ),
+            free_cells,
+        )
+        while len(self.landmarks) < count and candidate not in self.landmarks:
+            table = graph.distance_map(
+                candidate // self.columns, candidate % self.columns, allow_diagonal
+            )
+            self.landmarks.append(candidate)
+            self.tables.append(table)
+            for cell in free_cells:
+                distance = table[cell]
+                if distance != -1 and (closest[cell] == -1 or distance < closest[cell]):
+                    closest[cell] = distance
+            candidate = self._farthest(closest, free_cells)
+
+    @staticmethod
+    def _farthest(distances: array, free_cells: list[int]) -> int:
+        """Finds the free cell with the biggest distance, unreached cells first.
+
+        Args:
+            distances (array): The distances of the cells, -1 for unreached cells.
+            free_cells (list[int]): The ids of the cells that aren't walls.
+
+        Returns:
+            int: The id of the farthest cell.
+        """
+        best_cell = free_cells[0]
+        best_distance = -2
+        for cell in free_cells:
+            distance = distances[cell]
+            if distance == -1:
+                return cell
+            if distance > best_distance:
+                best_cell = cell
+                best_distance = distance
+        return best_cell
+
+    def __call__(self, cell: int, dest: int) -> int:
+        """Gives a lower bound of the distance between two cells.
+
+        Args:
+            cell (int): The id of the cell to measure from.
+            dest (int): The id of the cell to measure to.
+
+        Returns:
+            int: The biggest of the landmark bounds and of the Manhattan or Chebyshev
+            distance between the two cells.
+        """
+        if dest != self._dest:
+            # Searches ask for the same destination again and again
+            self._dest = dest
+            self._dest_distances = tuple(table[dest] for table in self.tables)
+        row_diff = abs(cell // self.columns - dest // self.columns)
+        column_diff = abs(cell % self.columns - dest % self.columns)
+        if self.allow_diagonal:
+            best = row_diff if row_diff > column_diff else column_diff
+        else:
+            best = row_diff + column_diff
+        for table, dest_distance in zip(self.tables, self._dest_distances):
+            distance = table[cell]
+            if distance == -1 or dest_distance == -1:
+                continue
+            bound = distance - dest_distance
+            if bound < 0:
+                bound = -bound
+            if bound > best:
+                best = bound
+        return best
+
+    def matches(self, graph: maze.Graph) -> bool:
+        """Checks if the index was built for a graph of the same size and walls.
+
+        Args:
+            graph (maze.Graph): The graph to check.
+
+        Returns:
+            bool: True if the index can be used with the graph.
+        """
+        return (
+            graph.rows == self.rows
+            and graph.columns == self.columns
+            and zlib.crc32(graph.occupancy) == self.checksum
+        )
+
+    def save(self, path: str) -> None:
+        """Saves the index to a file: a JSON header line followed by the raw tables.
+
+        Args:
+            path (str): The path of the file to write.
+        """
+        header = {
+            "rows": self.rows,
+            "columns": self.columns,
+            "allow_diagonal": self.allow_diagonal,
+            "checksum": self.checksum,
+            "landmarks": self.landmarks,
+            "itemsize": array("i").itemsize,
+        }
+        with open(path, "wb") as file:
+            file.write(json.dumps(header).encode("utf-8") + b"\n")
+            for table in self.tables:
+                table.tofile(file)
+
+    @classmethod
+    def load(cls, path: str, graph: maze.Graph = None) -> "LandmarkIndex":
+        """Loads an index saved by LandmarkIndex.save.
+
+        Args:
+            path (str): The path of the file to read.
+            graph (maze.Graph, optional): The graph the index will be used with.
+            Defaults to None (not checked).
+
+        Returns:
+            LandmarkIndex: The loaded index.
+
+        Raises:
+            ValueError: If the file was written on a platform with another int size,
+            or if the graph isn't the one the index was built for.
+        """
+        with open(path, "rb") as file:
+            header = json.loads(file.readline().decode("utf-8"))
+            if header["itemsize"] != array("i").itemsize:
+                raise ValueError("The index was saved with another int size")
+            index = cls.__new__(cls)
+            index.rows = header["rows"]
+            index.columns = header["columns"]
+            index.allow_diagonal = header["allow_diagonal"]
+            index.checksum = header["checksum"]
+            index.landmarks = header["landmarks"]
+            index.tables = []
+            index._dest = -1
+            index._dest_distances = ()
+            for _ in index.landmarks:
+                table = array("i")
+                table.fromfile(file, index.rows * index.columns)
+                index.tables.append(table)
+        if graph is not None and not index.matches(graph):
+            raise ValueError("The index was built for another map")
+        return index
@@ -1,12 +1,65 @@
 # -*- encoding: utf-8 -*-
+import heapq
+import math
+import time
+import weakref
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Row and column offsets of the neighbours of a cell, in the order of Graph.get_neighbours
+DIAGONAL_OFFSETS = (
+    (-1, -1),
+    (-1, 0),
+    (-1, 1),
+    (0, -1),
+    (0, 1),
+    (1, -1),
+    (1, 0),
+    (1, 1),
+)
+STRAIGHT_OFFSETS = ((-1, 0), (0, -1), (0, 1), (1, 0))
+
+# The smallest wavefront Graph.flow_field expands with NumPy array operations.
+# Narrower ones, such as the two ends of a corridor, are cheaper in a Python loop
+VECTORISED_WAVEFRONT = 32
+
+# Outcomes of a search, see Graph.last_status
+FOUND = "found"
+NO_PATH = "no path"
+BUDGET_EXHAUSTED = "budget exhausted"
+
+
 class Node:
-    """This class represents the Nodes of the Graph where the search algorithm is used."""
+    """This class represents the Nodes of the Graph where the search algorithm is used.
+    It uses __slots__ so that large grids don't pay for a dictionary per Node.
+    """
+
+    __slots__ = (
+        "row",
+        "column",
+        "cell",
+        "parent",
+        "g",
+        "h",
+        "f",
+        "generation",
+        "closed",
+    )
 
-    def __init__(self, row: int, column: int, parent: "Node" = None) -> None:
+    def __init__(
+        self, row: int, column: int, parent: "Node" = None, cell: int = -1
+    ) -> None:
         """Creates a Node with the given position and default heuristics
 
         Attributes:
-            position (tuple): The position (row, column) of the Node
+            row (int): The row of the Node
+            column (int): The column of the Node
+            cell (int): The id of the Node's cell in its Graph (row * columns + column),
+                -1 if the Node doesn't belong to a Graph.
 
             parent (Node) : The parent Node of this Node.
                 This is used to find the path to the destination in the a star algorithm.
@@ -15,6 +68,10 @@ class Node:
             h (int): The number of Nodes separating this Node to the goal Node
             f (int): The total cost of the Node (calculated by doing g + h)
 
+            generation (int): The search of the Graph that last reached this Node.
+                parent, g, h, f and closed are only valid for that search.
+            closed (bool): Whether that search has already explored this Node.
+
         Args:
             row (int): The row of the Node
 
@@ -22,12 +79,25 @@ class Node:
 
             parent (Node, optional): The Node's parent Node.
                 Defaults to None.
+
+            cell (int, optional): The id of the Node's cell in its Graph.
+                Defaults to -1.
         """
-        self.position = (row, column)
+        self.row = row
+        self.column = column
+        self.cell = cell
         self.parent = parent
         self.g = 0
         self.h = 999
-        self.f = self.g + self.h
+        # Shares the h int object instead of allocating a new one per Node
+        self.f = self.h
+        self.generation = 0
+        self.closed = False
+
+    @property
+    def position(self) -> tuple[int, int]:
+        """tuple[int, int]: The position (row, column) of the Node."""
+        return (self.row, self.column)
 
     def __eq__(self, other) -> bool:
         """Checks if the Node is equal to the other object.
@@ -40,7 +110,7 @@ class Node:
         """
         if other is None or type(self) is not type(other):
             return False
-        return self.position == other.position
+        return self.row == other.row and self.column == other.column
 
     def __lt__(self, other: "Node") -> bool:
         """Decides in which order the Nodes should be sorted based on their heuristics.
@@ -59,7 +129,9 @@ class Node:
             return False
         return self.g > other.g
 
-    def set_heuristic(self, dest_node: "Node", allow_diagonal: bool = False) -> None:
+    def set_heuristic(
+        self, dest_node: "Node", allow_diagonal: bool = False, weight: float = 1
+    ) -> None:
         """Set the heuristics of a Node. If diagonal movement is allowed,
          the chebyshev distance is used for that. Otherwise, the simple
          manhattan distance is used for that.
@@ -69,21 +141,26 @@ class Node:
             allow_diagonal (bool, optional): The flag that tells if
             diagonal movement is allowed.
             Defaults to False.
+            weight (float, optional): The factor applied to the heuristic in f,
+            greater than 1 for weighted A*. Defaults to 1.
         """
-        row = self.position[0]
-        column = self.position[1]
-
-        dest_row = dest_node.position[0]
-        dest_column = dest_node.position[1]
-
-        row_diff_dest = abs(row - dest_row)
-        column_diff_dest = abs(column - dest_column)
+        # Same results as manhattan_distance and chebyshev_distance, inlined
+        # because this runs for every neighbour of every explored Node
+        row_diff_dest = self.row - dest_node.row
+        if row_diff_dest < 0:
+            row_diff_dest = -row_diff_dest
+        column_diff_dest = self.column - dest_node.column
+        if column_diff_dest < 0:
+            column_diff_dest = -column_diff_dest
 
         if allow_diagonal:
-            self.h = self.chebyshev_distance(row_diff_dest, column_diff_dest)
+            if row_diff_dest > column_diff_dest:
+                self.h = row_diff_dest
+            else:
+                self.h = column_diff_dest
         else:
-            self.h = self.manhattan_distance(row_diff_dest, column_diff_dest)
-        self.f = self.g + self.h
+            self.h = row_diff_dest + column_diff_dest
+        self.f = self.g + weight * self.h
 
     def manhattan_distance(self, row_diff: int, column_diff: int) -> int:
         """Calculates the distance between two Nodes using the manhattan distance technique.
@@ -115,6 +192,215 @@ class Node:
             return column_diff
 
 
+class SearchStats:
+    """This class collects the counters of a search, for the searches that take a
+    stats argument such as Graph.a_star_algo. The callbacks are optional and are
+    called with cell ids (row * columns + column), so they work with every Graph.
+    Searches run without stats don't measure anything.
+    """
+
+    def __init__(self, on_expand=None, on_push=None, on_goal=None) -> None:
+        """Creates empty stats with the given callbacks.
+
+        Attributes:
+            on_expand (callable): Called with (cell, g) every time a cell is expanded.
+            on_push (callable): Called with (cell, g, f) every time a cell is pushed
+            to the heap of the cells to explore.
+            on_goal (callable): Called with (cell, g) when the goal cell is reached.
+            expansions (int): The number of expanded cells.
+            pushes (int): The number of entries pushed to the heap.
+            pops (int): The number of entries popped from the heap, outdated ones
+            included.
+            peak_open (int): The largest size reached by the heap.
+            heuristic_calls (int): The number of times the heuristic was computed.
+            neighbour_time (float): The time spent listing the free neighbours of
+            the expanded cells, in seconds.
+            wall_time (float): The time the search took, in seconds.
+
+        Args:
+            on_expand (callable, optional): See on_expand. Defaults to None.
+            on_push (callable, optional): See on_push. Defaults to None.
+            on_goal (callable, optional): See on_goal. Defaults to None.
+        """
+        self.on_expand = on_expand
+        self.on_push = on_push
+        self.on_goal = on_goal
+        self.reset()
+
+    def reset(self) -> None:
+        """Sets every counter back to 0. The callbacks are kept."""
+        self.expansions = 0
+        self.pushes = 0
+        self.pops = 0
+        self.peak_open = 0
+        self.heuristic_calls = 0
+        self.neighbour_time = 0.0
+        self.wall_time = 0.0
+
+    def as_dict(self) -> dict:
+        """Gets the counters.
+
+        Returns:
+            dict: The counters, by attribute name.
+        """
+        return {
+            "expansions": self.expansions,
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "peak_open": self.peak_open,
+            "heuristic_calls": self.heuristic_calls,
+            "neighbour_time": self.neighbour_time,
+            "wall_time": self.wall_time,
+        }
+
+    def __str__(self) -> str:
+        return (
+            "%d expanded, %d pushed, %d popped, %d at most in the heap\n"
+            "%d heuristic calls, %.1f ms listing neighbours, %.1f ms in total"
+            % (
+                self.expansions,
+                self.pushes,
+                self.pops,
+                self.peak_open,
+                self.heuristic_calls,
+                self.neighbour_time * 1000,
+                self.wall_time * 1000,
+            )
+        )
+
+
+class SearchResult:
+    """This class holds the outcome of a search such as Graph.a_star_algo.
+
+    The cost of the path is known as soon as the search is over, but the path is only
+    built from the parents left by the search the first time it is asked for. A new
+    search of the same Graph overwrites those parents, so the Graph builds the path of
+    its last result before searching again, unless that result was dropped.
+
+    The explored cells are kept as an array of cell ids. The explored Nodes are only
+    kept when the search is asked to. Iterating over a result gives its path and its
+    explored Nodes (or cell ids), so it can be unpacked like the (path, explored)
+    tuples of the other searches.
+    """
+
+    def __init__(
+        self,
+        graph: "Graph",
+        status: str,
+        cost: int,
+        dest: int,
+        explored_cells: array,
+        explored: list = None,
+        suboptimality: float = None,
+    ) -> None:
+        """Creates the result of a search whose path isn't built yet.
+
+        Attributes:
+            graph (Graph): The graph holding the parents of the path,
+            None once the path is built.
+            status (str): The outcome of the search, FOUND or NO_PATH.
+            cost (int): The number of moves of the path, None if there is no path.
+            dest (int): The cell id of the goal Node.
+            explored_cells (array): The ids of the explored cells, in the order they
+            were explored.
+            explored (list[Node]): The explored Nodes, None if they weren't kept.
+            suboptimality (float): A bound on the ratio between the length of the path
+            and the shortest one, see Graph.last_suboptimality.
+
+        Args:
+            graph (Graph): The graph that was searched.
+            status (str): The outcome of the search.
+            cost (int): The number of moves of the path, None if there is no path.
+            dest (int): The cell id of the goal Node.
+            explored_cells (array): The ids of the explored cells.
+            explored (list, optional): The explored Nodes. Defaults to None.
+            suboptimality (float, optional): The bound on the suboptimality of the
+            path. Defaults to None.
+        """
+        self.graph = graph if cost is not None else None
+        self.status = status
+        self.cost = cost
+        self.dest = dest
+        self.explored_cells = explored_cells
+        self.explored = explored
+        self.suboptimality = suboptimality
+        self._path = None
+
+    @property
+    def path(self) -> list[tuple[int, int]]:
+        """list[tuple[int, int]]: The positions of the Nodes of the path,
+        None if there is no path."""
+        if self.graph is not None:
+            self._path = self.graph.trace_path(self.dest)
+            self.graph = None
+        return self._path
+
+    def freeze(self) -> None:
+        """Builds the path if it isn't built yet, so that it doesn't depend on the
+        state of the graph anymore.
+        """
+        self.path
+
+    def __iter__(self):
+        yield self.path
+        yield self.explored if self.explored is not None else self.explored_cells
+
+    def __getitem__(self, index: int):
+        return tuple(self)[index]
+
+
+class GoalIndex:
+    """This class stores the distance from every cell to the closest of a set of goal
+    cells, ignoring the walls: the Chebyshev distance with diagonal movement and the
+    Manhattan distance without. It is a consistent heuristic for
+    Graph.multi_goal_a_star_algo that costs the same for any number of goals.
+
+    Building it takes a wavefront over the whole map, so it only pays off when it is
+    reused: since the walls are ignored, it stays valid when they change, and can be
+    passed to every search toward the same goals.
+    """
+
+    def __init__(
+        self, graph: "Graph", goals: list[tuple[int, int]], allow_diagonal=True
+    ) -> None:
+        """Computes the distances to the goals with a wavefront over an empty grid
+        of the size of the Graph, see wavefront.
+
+        Attributes:
+            allow_diagonal (bool): The movement mode the distances were computed for.
+            goals (frozenset[int]): The cell ids of the goals.
+            distances (array): The distance from every cell to the closest goal,
+            indexed by cell id.
+
+        Args:
+            graph (Graph): The graph of the goals.
+            goals (list[tuple[int, int]]): The positions of the goals.
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+        """
+        columns = graph.columns
+        self.allow_diagonal = allow_diagonal
+        self.goals = frozenset(row * columns + column for row, column in goals)
+        self.distances = wavefront(
+            bytearray(graph.rows * columns),
+            graph.rows,
+            columns,
+            list(self.goals),
+            allow_diagonal,
+        )
+
+    def __call__(self, cell: int) -> int:
+        """Gets a lower bound of the distance from a cell to the closest goal.
+
+        Args:
+            cell (int): The cell id.
+
+        Returns:
+            int: The distance to the closest goal, ignoring the walls.
+        """
+        return self.distances[cell]
+
+
 class Graph:
     """This class represents the maze containing all the Nodes for the a star algorithm."""
 
@@ -130,8 +416,22 @@ class Graph:
             rows (int): The number of rows of the graph.
             columns (int): The number of columns of the graph.
             nodes (list): The list of all Nodes rows.
-            walls (list): The list of all walls. Walls are Nodes that can't be crossed
-            by the algorithm
+            wall_nodes (dict): The Nodes of all walls by cell id, in the order they
+            were added. Walls are Nodes that can't be crossed by the algorithm
+            occupancy (bytearray): One byte per cell, indexed by row * columns + column,
+            set to 1 when the cell is a wall.
+            generation (int): The number of searches run on the graph. A Node's search
+            state is stale unless its generation is the graph's generation.
+            version (int): The number of wall changes made to the graph.
+            last_suboptimality (float): A bound on the ratio between the length of
+            the last path found by a_star_algo or anytime_a_star_algo and the
+            shortest one, None if no path was found.
+            last_status (str): The outcome of the last search run by a_star_algo or
+            anytime_a_star_algo: FOUND, NO_PATH or BUDGET_EXHAUSTED.
+            last_result (weakref.ref): A weak reference to the SearchResult of the
+            last search run by a_star_algo, None before the first one.
+            listeners (list): The functions called with (row, column, is_wall)
+            every time a cell becomes a wall or stops being one.
 
         Args:
             rows (int): The number of rows of the graph.
@@ -145,22 +445,112 @@ class Graph:
         self.dest_node: Node = dest_node
         self.rows = rows
         self.columns = columns
+        self.generation = 0
+        self.version = 0
+        self.last_suboptimality = None
+        self.last_status = None
+        self.last_result = None
+        self.listeners = []
         self.nodes = []
-        self.walls: list[Node] = []
+        self.wall_nodes: dict[int, Node] = {}
+        self.occupancy = bytearray(rows * columns)
+        # Reusing the same column ints for every row saves one int object per Node
+        column_values = list(range(columns))
         for row in range(rows):
             list_nodes = []
-            for column in range(columns):
-                list_nodes.append(Node(row=row, column=column, parent=None))
+            first_cell = row * columns
+            for column in column_values:
+                list_nodes.append(
+                    Node(row=row, column=column, parent=None, cell=first_cell + column)
+                )
             self.nodes.append(list_nodes)
 
+    @property
+    def walls(self) -> list[Node]:
+        """list[Node]: The list of all walls, in the order they were added."""
+        return list(self.wall_nodes.values())
+
     def add_wall(self, row: int, column: int) -> None:
-        """Adds a wall to the Graph's walls list.
+        """Adds a wall to the Graph's walls list and marks its cell as occupied.
+        Adding the same wall twice has no effect.
 
         Args:
             row (int): The row of the Node to add to the list
             column (int): The column of the Node to add to the list
+
+        Raises:
+            IndexError: If the row or column is outside of the Graph.
         """
-        self.walls.append(self.get_node(row, column))
+        cell = self._cell(row, column)
+        node = self.nodes[row][column]
+        if not self.occupancy[cell]:
+            self.occupancy[cell] = 1
+            self.wall_nodes[cell] = node
+            self.version += 1
+            self.notify_listeners(row, column, True)
+
+    def remove_wall(self, row: int, column: int) -> None:
+        """Removes a wall from the Graph's walls list and marks its cell as free.
+        Removing a cell that is not a wall has no effect.
+
+        Args:
+            row (int): The row of the Node to remove from the list
+            column (int): The column of the Node to remove from the list
+
+        Raises:
+            IndexError: If the row or column is outside of the Graph.
+        """
+        cell = self._cell(row, column)
+        if self.occupancy[cell]:
+            self.occupancy[cell] = 0
+            del self.wall_nodes[cell]
+            self.version += 1
+            self.notify_listeners(row, column, False)
+
+    def _cell(self, row: int, column: int) -> int:
+        """Gets the index of the cell at the given row and column.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+
+        Returns:
+            int: The index of the cell, see Graph.occupancy.
+
+        Raises:
+            IndexError: If the row or column is bigger than the Graph's
+            row or columns or is smaller than 0.
+        """
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            raise IndexError(f"The cell {(row, column)} isn't inside the graph")
+        return row * self.columns + column
+
+    def add_listener(self, listener) -> None:
+        """Registers a function to call every time the walls of the Graph change.
+
+        Args:
+            listener (callable): The function, called with (row, column, is_wall).
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        """Unregisters a function registered with Graph.add_listener.
+
+        Args:
+            listener (callable): The function to unregister.
+        """
+        self.listeners.remove(listener)
+
+    def notify_listeners(self, row: int, column: int, is_wall: bool) -> None:
+        """Tells every listener that a cell became a wall or stopped being one.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            is_wall (bool): True if the cell is now a wall.
+        """
+        for listener in self.listeners:
+            listener(row, column, is_wall)
 
     def is_wall(self, node_to_check: Node) -> bool:
         """Checks if the given Node is a wall.
@@ -171,7 +561,8 @@ class Graph:
         Returns:
             bool: True if it the Node to check is a wall. False otherwise.
         """
-        return node_to_check in self.walls
+        cell = node_to_check.row * self.columns + node_to_check.column
+        return self.occupancy[cell] == 1
 
     def get_neighbours(self, current_node: Node, allow_diagonal=True) -> list[Node]:
         """Gets all Nodes accessible to the current Node with only one step.
@@ -188,8 +579,8 @@ class Graph:
         Returns:
             list[Node]: The list of all neighbouring Nodes of the current Node.
         """
-        row = current_node.position[0]
-        column = current_node.position[1]
+        row = current_node.row
+        column = current_node.column
         list_neighbours = []
         if allow_diagonal:
             for i in range(row - 1, row + 2):
@@ -245,47 +636,1969 @@ class Graph:
         """
         self.dest_node = self.get_node(row, column)
 
-    def a_star_algo(self, allow_diagonal=True) -> list[tuple[int, int]]:
+    def trace_path(self, cell: int) -> list[tuple[int, int]]:
+        """Follows the parents left by the last search from a cell back to the
+        starting Node.
+
+        Args:
+            cell (int): The id of a cell reached by the last search.
+
+        Returns:
+            list[tuple[int, int]]: The positions of the Nodes from the starting Node
+            to the cell.
+        """
+        current = self.get_node(cell // self.columns, cell % self.columns)
+        path = []
+        while current is not None:
+            path.append(current.position)
+            current = current.parent
+        # Return reversed path
+        return path[::-1]
+
+    def freeze_last_result(self) -> None:
+        """Builds the path of the last SearchResult of a_star_algo, if it is still
+        used, before a new search overwrites the parents it is built from.
+        """
+        if self.last_result is not None:
+            result = self.last_result()
+            if result is not None:
+                result.freeze()
+            self.last_result = None
+
+    def _new_result(
+        self, status: str, cost: int, dest: int, explored_cells: array, explored: list
+    ) -> SearchResult:
+        """Creates the result of a search and remembers it, see freeze_last_result.
+
+        Args:
+            status (str): The outcome of the search.
+            cost (int): The number of moves of the path, None if there is no path.
+            dest (int): The cell id of the goal Node.
+            explored_cells (array): The ids of the explored cells.
+            explored (list): The explored Nodes, None if they aren't kept.
+
+        Returns:
+            SearchResult: The result.
+        """
+        result = SearchResult(
+            self,
+            status,
+            cost,
+            dest,
+            explored_cells,
+            explored,
+            self.last_suboptimality,
+        )
+        self.last_result = weakref.ref(result)
+        return result
+
+    def a_star_algo(
+        self,
+        allow_diagonal=True,
+        heuristic=None,
+        epsilon: float = 0,
+        stats: SearchStats = None,
+        keep_explored=False,
+    ) -> SearchResult:
         """Uses the a star algorithm to find the shortest path between
         the starting Node and the goal Node.
         See https://en.wikipedia.org/wiki/A*_search_algorithm
 
+        The Nodes to explore are kept in a binary heap ordered like Node.__lt__
+        (lowest f first, then highest g). When a better g is found for a Node
+        that is already waiting, it is pushed again and the outdated entry is
+        skipped when it gets popped.
+
+        The graph can be searched again with other start and goal Nodes. Each search
+        gets a new generation, so the state left on Nodes by earlier searches is
+        ignored without having to reset the whole grid.
+
+        With a positive epsilon, the heuristic is multiplied by 1 + epsilon (weighted
+        A*). The search goes straighter to the goal and explores fewer Nodes, and the
+        path is at most 1 + epsilon times longer than the shortest one. Expanded Nodes
+        are not expanded again when a better g is found for them. The ratio actually
+        reached is bounded by the Nodes still waiting when the goal is found and by
+        those expanded Nodes, and stored in Graph.last_suboptimality.
+
+        The path of the result is only built when it is asked for, so queries that
+        only need the cost don't pay for it.
+
         Args:
             allow_diagonal (bool, optional): The flag that tells if
             diagonal movement is allowed. Defaults to True.
+            heuristic (callable, optional): A function giving a lower bound of the
+            distance between two cells from their ids, such as a
+            landmarks.LandmarkIndex built with the same allow_diagonal. It must be
+            consistent. Defaults to None (Node.set_heuristic).
+            epsilon (float, optional): How much longer than the shortest path the
+            path may be, as a fraction of its length. Defaults to 0.
+            stats (SearchStats, optional): The stats to fill with the counters of
+            the search and whose callbacks to call. Defaults to None.
+            keep_explored (bool, optional): Whether to keep the explored Nodes in the
+            result, and not only their cell ids. Defaults to False.
 
         Returns:
-            list[tuple[int, int]]: The list of positions of all Nodes in the shortest path.
+            SearchResult: The cost and path of the shortest path, and the explored
+            cells.
         """
-        explored = []
+        if epsilon < 0:
+            raise ValueError(f"epsilon can't be negative, got {epsilon}")
+        weight = 1 + epsilon
+        self.last_suboptimality = None
+        self.last_status = NO_PATH
+        instrumented = stats is not None
+        if instrumented:
+            search_started = time.perf_counter()
+        occupancy = self.occupancy
+        dest_cell = self.dest_node.row * self.columns + self.dest_node.column
+        self.freeze_last_result()
+        self.generation += 1
+        generation = self.generation
+        explored_cells = array("i")
+        explored = [] if keep_explored else None
         to_explore = []
-        self.start_node.g = 0
-        self.start_node.set_heuristic(self.dest_node, allow_diagonal)
-        to_explore.append(self.start_node)
+        # The counter keeps heap entries unique and pops equal entries in insertion order
+        counter = 0
+        # The lowest g + h of the expanded Nodes that were reached again with a better g
+        reopened_bound = math.inf
+        # The Graph's own Node, in case start_node was created outside of the Graph
+        start_node = self.get_node(self.start_node.row, self.start_node.column)
+        start_node.generation = generation
+        start_node.closed = False
+        start_node.parent = None
+        start_node.g = 0
+        if heuristic is None:
+            start_node.set_heuristic(self.dest_node, allow_diagonal, weight)
+        else:
+            start_node.h = heuristic(start_node.cell, dest_cell)
+            start_node.f = weight * start_node.h
+        heapq.heappush(to_explore, (start_node.f, -start_node.g, counter, start_node))
+        if instrumented:
+            self._count_push(stats, start_node.cell, 0, start_node.f, 1)
         while to_explore:
-            to_explore.sort()
-            current = to_explore.pop(0)
-            explored.append(current)
+            _, neg_g, _, current = heapq.heappop(to_explore)
+            if instrumented:
+                stats.pops += 1
+            # Lazy deletion: skip entries superseded by a better g or already expanded
+            if current.closed or -neg_g != current.g:
+                continue
+            current.closed = True
+            explored_cells.append(current.cell)
+            if keep_explored:
+                explored.append(current)
+            if instrumented:
+                stats.expansions += 1
+                if stats.on_expand is not None:
+                    stats.on_expand(current.cell, current.g)
             if current == self.dest_node:
-                path = []
-                while current != self.start_node:
-                    path.append(current.position)
-                    current = current.parent
-                path.append(self.start_node.position)
-                # Return reversed path
-                return path[::-1], explored
+                self.last_status = FOUND
+                if instrumented and stats.on_goal is not None:
+                    stats.on_goal(current.cell, current.g)
+                self.last_suboptimality = 1.0
+                if epsilon:
+                    # Every unexplored path goes through a waiting Node or through an
+                    # expanded Node reached again with a better g, and h is a lower
+                    # bound: the shortest path is at least the lowest g + h of them
+                    lower_bound = min(current.g, reopened_bound)
+                    for _, neg_g, _, node in to_explore:
+                        if not node.closed and -neg_g == node.g:
+                            lower_bound = min(lower_bound, node.g + node.h)
+                    if lower_bound:
+                        self.last_suboptimality = current.g / lower_bound
+                if instrumented:
+                    stats.wall_time += time.perf_counter() - search_started
+                return self._new_result(
+                    FOUND, current.g, current.cell, explored_cells, explored
+                )
 
-            neighbours = self.get_neighbours(current, allow_diagonal)
+            new_g = current.g + 1
+            if instrumented:
+                listing_started = time.perf_counter()
+                neighbours = self.get_neighbours(current, allow_diagonal)
+                stats.neighbour_time += time.perf_counter() - listing_started
+            else:
+                neighbours = self.get_neighbours(current, allow_diagonal)
             for neighbour in neighbours:
-                neighbour.g = current.g + 1
-                neighbour.set_heuristic(self.dest_node, allow_diagonal)
-            neighbours.sort()
+                if occupancy[neighbour.cell]:
+                    continue
+                if neighbour.generation != generation:
+                    # First time this search reaches the Node: forget older searches
+                    neighbour.generation = generation
+                    neighbour.closed = False
+                elif neighbour.closed:
+                    # Weighted searches don't expand a Node again, but the better g
+                    # still bounds the shortest path, see last_suboptimality
+                    if epsilon and new_g + neighbour.h < reopened_bound:
+                        reopened_bound = new_g + neighbour.h
+                    continue
+                elif new_g >= neighbour.g:
+                    continue
+                neighbour.g = new_g
+                if heuristic is None:
+                    neighbour.set_heuristic(self.dest_node, allow_diagonal, weight)
+                else:
+                    neighbour.h = heuristic(neighbour.cell, dest_cell)
+                    neighbour.f = new_g + weight * neighbour.h
+                neighbour.parent = current
+                counter += 1
+                heapq.heappush(to_explore, (neighbour.f, -new_g, counter, neighbour))
+                if instrumented:
+                    self._count_push(
+                        stats, neighbour.cell, new_g, neighbour.f, len(to_explore)
+                    )
+        if instrumented:
+            stats.wall_time += time.perf_counter() - search_started
+        return self._new_result(NO_PATH, None, dest_cell, explored_cells, explored)
+
+    @staticmethod
+    def _count_push(
+        stats: SearchStats, cell: int, g: int, f: float, open_size: int
+    ) -> None:
+        """Counts a cell pushed to the heap by a search, along with the computation
+        of its heuristic, and calls the on_push callback.
+
+        Args:
+            stats (SearchStats): The stats of the search.
+            cell (int): The cell id.
+            g (int): The g value of the cell.
+            f (float): The priority of the cell in the heap.
+            open_size (int): The size of the heap after the push.
+        """
+        stats.pushes += 1
+        stats.heuristic_calls += 1
+        if open_size > stats.peak_open:
+            stats.peak_open = open_size
+        if stats.on_push is not None:
+            stats.on_push(cell, g, f)
+
+    def a_star_steps(
+        self,
+        allow_diagonal=True,
+        step_size: int = 64,
+        heuristic=None,
+        stats: SearchStats = None,
+    ):
+        """Runs the a star algorithm a few expansions at a time, so that a caller such
+        as a GUI event loop can do something else between steps. It explores the cells
+        in the same order as Graph.a_star_algo.
+
+        This is a generator: it yields the Nodes explored since the previous step
+        every step_size expansions, and returns the path when the search is over
+        (the value of the StopIteration). Closing it stops the search.
+
+        Args:
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+            step_size (int, optional): The number of expansions between two steps.
+            Defaults to 64.
+            heuristic (callable, optional): A function giving a lower bound of the
+            distance between two cells from their ids, see Graph.a_star_algo.
+            Defaults to None (Manhattan or Chebyshev distance).
+            stats (SearchStats, optional): The stats to fill with the counters of
+            the search, see Graph.a_star_algo. The time between two steps isn't
+            counted. Defaults to None.
+
+        Yields:
+            list[Node]: The Nodes explored during the step.
+
+        Returns:
+            list[tuple[int, int]]: The list of positions of all Nodes in the shortest
+            path, None if there is none.
+        """
+        if step_size < 1:
+            raise ValueError(f"step_size must be at least 1, got {step_size}")
+        columns = self.columns
+        dest_row = self.dest_node.row
+        dest_column = self.dest_node.column
+        start = self.start_node.row * columns + self.start_node.column
+        dest = dest_row * columns + dest_column
+        self.last_suboptimality = None
+        self.last_status = NO_PATH
+        if self.occupancy[start] or self.occupancy[dest]:
+            return None
+        instrumented = stats is not None
+        if instrumented:
+            resumed = time.perf_counter()
+
+        def estimate(cell: int) -> int:
+            if heuristic is not None:
+                return heuristic(cell, dest)
+            row_diff = abs(cell // columns - dest_row)
+            column_diff = abs(cell % columns - dest_column)
+            if allow_diagonal:
+                return row_diff if row_diff > column_diff else column_diff
+            return row_diff + column_diff
+
+        g_scores = {start: 0}
+        parents = {start: -1}
+        closed = set()
+        to_explore = [(estimate(start), 0, 0, start)]
+        if instrumented:
+            self._count_push(stats, start, 0, to_explore[0][0], 1)
+        counter = 0
+        step = []
+        while to_explore:
+            _, neg_g, _, cell = heapq.heappop(to_explore)
+            if instrumented:
+                stats.pops += 1
+            # Lazy deletion: skip entries superseded by a better g or already expanded
+            if cell in closed or -neg_g != g_scores[cell]:
+                continue
+            closed.add(cell)
+            step.append(self.get_node(cell // columns, cell % columns))
+            if instrumented:
+                stats.expansions += 1
+                if stats.on_expand is not None:
+                    stats.on_expand(cell, -neg_g)
+            if cell == dest:
+                if instrumented and stats.on_goal is not None:
+                    stats.on_goal(cell, -neg_g)
+                break
+            if len(step) >= step_size:
+                if instrumented:
+                    stats.wall_time += time.perf_counter() - resumed
+                yield step
+                if instrumented:
+                    resumed = time.perf_counter()
+                step = []
+            new_g = 1 - neg_g
+            if instrumented:
+                listing_started = time.perf_counter()
+                neighbours = self.neighbour_cells(cell, allow_diagonal)
+                stats.neighbour_time += time.perf_counter() - listing_started
+            else:
+                neighbours = self.neighbour_cells(cell, allow_diagonal)
             for neighbour in neighbours:
-                if self.is_wall(neighbour):
+                if neighbour in closed or new_g >= g_scores.get(neighbour, new_g + 1):
                     continue
-                if neighbour in explored:
+                g_scores[neighbour] = new_g
+                parents[neighbour] = cell
+                counter += 1
+                f = new_g + estimate(neighbour)
+                heapq.heappush(to_explore, (f, -new_g, counter, neighbour))
+                if instrumented:
+                    self._count_push(stats, neighbour, new_g, f, len(to_explore))
+        if step:
+            if instrumented:
+                stats.wall_time += time.perf_counter() - resumed
+            yield step
+            if instrumented:
+                resumed = time.perf_counter()
+        if dest not in closed:
+            if instrumented:
+                stats.wall_time += time.perf_counter() - resumed
+            return None
+        self.last_status = FOUND
+        self.last_suboptimality = 1.0
+        path = []
+        cell = dest
+        while cell != -1:
+            path.append((cell // columns, cell % columns))
+            cell = parents[cell]
+        if instrumented:
+            stats.wall_time += time.perf_counter() - resumed
+        # Return reversed path
+        return path[::-1]
+
+    def multi_goal_a_star_algo(
+        self, goals: list[tuple[int, int]], allow_diagonal=True, heuristic=None
+    ) -> list[tuple[int, int]]:
+        """Uses the a star algorithm to find the shortest path between the starting
+        Node and the closest of several goal cells, in a single search. The goal Node
+        of the graph isn't used.
+
+        The heuristic of a cell is its distance to the closest goal, ignoring the
+        walls. It is consistent, so the first goal explored is the closest one. By
+        default it is computed with a loop over the goals, which costs nothing to set
+        up but grows with the number of goals. For many searches toward a large set of
+        goals, a GoalIndex built once and passed as the heuristic costs the same for
+        any number of goals, but building it takes a pass over the whole map.
+
+        Args:
+            goals (list[tuple[int, int]]): The positions of the goal cells.
+            Walls are left out.
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+            heuristic (callable, optional): A function giving a lower bound of the
+            distance between a cell and the closest goal from its id, such as a
+            GoalIndex of the same goals reused between searches. It must be
+            consistent. Defaults to None.
+
+        Returns:
+            list[tuple[int, int]]: The list of positions of all Nodes in the shortest
+            path, ending on the closest goal. None if no goal can be reached.
+        """
+        columns = self.columns
+        occupancy = self.occupancy
+        start = self.start_node.row * columns + self.start_node.column
+        goal_cells = {
+            row * columns + column
+            for row, column in goals
+            if not occupancy[row * columns + column]
+        }
+        self.last_suboptimality = None
+        self.last_status = NO_PATH
+        if not goal_cells or occupancy[start]:
+            return None, []
+        if heuristic is None:
+            positions = [divmod(goal, columns) for goal in goal_cells]
+
+            def heuristic(cell: int) -> int:
+                row = cell // columns
+                column = cell - row * columns
+                closest = None
+                for goal_row, goal_column in positions:
+                    row_diff = abs(row - goal_row)
+                    column_diff = abs(column - goal_column)
+                    if allow_diagonal:
+                        distance = row_diff if row_diff > column_diff else column_diff
+                    else:
+                        distance = row_diff + column_diff
+                    if closest is None or distance < closest:
+                        closest = distance
+                return closest
+
+        g_scores = {start: 0}
+        parents = {start: -1}
+        closed = set()
+        explored = []
+        to_explore = [(heuristic(start), 0, 0, start)]
+        counter = 0
+        while to_explore:
+            _, neg_g, _, cell = heapq.heappop(to_explore)
+            # Lazy deletion: skip entries superseded by a better g or already expanded
+            if cell in closed or -neg_g != g_scores[cell]:
+                continue
+            closed.add(cell)
+            explored.append(self.get_node(cell // columns, cell % columns))
+            if cell in goal_cells:
+                self.last_status = FOUND
+                self.last_suboptimality = 1.0
+                path = []
+                while cell != -1:
+                    path.append((cell // columns, cell % columns))
+                    cell = parents[cell]
+                # Return reversed path
+                return path[::-1], explored
+            new_g = 1 - neg_g
+            for neighbour in self.neighbour_cells(cell, allow_diagonal):
+                if neighbour in closed or new_g >= g_scores.get(neighbour, new_g + 1):
                     continue
-                if neighbour not in to_explore:
-                    neighbour.parent = current
-                    to_explore.append(neighbour)
+                g_scores[neighbour] = new_g
+                parents[neighbour] = cell
+                counter += 1
+                heapq.heappush(
+                    to_explore,
+                    (new_g + heuristic(neighbour), -new_g, counter, neighbour),
+                )
         return None, explored
+
+    def jump_point_search(self, allow_diagonal=True) -> list[tuple[int, int]]:
+        """Uses Jump Point Search to find a shortest path between the starting Node and
+        the goal Node. It is the a star algorithm, but instead of adding every
+        neighbour of a Node to explore, it jumps in straight and diagonal lines over the
+        cells that other shortest paths can reach just as well, and only stops on
+        "jump points" where the shortest paths can turn.
+        See https://harablog.wordpress.com/2011/09/07/jump-point-search/
+
+        Without diagonal movement, horizontal jumps stop where a wall next to them
+        ends, and vertical jumps stop where a horizontal jump would find something.
+
+        It expands far fewer Nodes than Graph.a_star_algo, but each jump costs more,
+        so it is only faster on open maps and maps of rooms. Median times per query on
+        300x300 ArrayGraphs of benchmarks/suite.py (diagonal / straight movement):
+        rooms 6 / 5 ms against 38 / 31 ms for a_star_algo, open 1.6 / 1.1 ms against
+        2.0 / 2.7 ms, but mazes 98 / 77 ms against 91 / 68 ms and 10% random walls
+        4.2 / 9.7 ms against 4.0 / 5.9 ms. With diagonal movement and 30% random walls,
+        it takes twice as long as a_star_algo.
+
+        Args:
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+
+        Returns:
+            list[tuple[int, int]]: The list of positions of all Nodes in the shortest path,
+            with the cells between jump points filled in.
+            The explored Nodes are the jump points that were expanded.
+        """
+        columns = self.columns
+        start = self.start_node.row * columns + self.start_node.column
+        dest = self.dest_node.row * columns + self.dest_node.column
+        dest_row = self.dest_node.row
+        dest_column = self.dest_node.column
+        if self.occupancy[start] or self.occupancy[dest]:
+            return None, []
+        # Vertical jumps search the columns as rows of this copy
+        transposed = None
+        if allow_diagonal:
+            transposed = b"".join(
+                self.occupancy[column::columns] for column in range(columns)
+            )
+
+        g_scores = {start: 0}
+        parents = {start: -1}
+        closed = set()
+        explored = []
+        counter = 0
+        to_explore = [(0, 0, counter, start)]
+        while to_explore:
+            _, neg_g, _, cell = heapq.heappop(to_explore)
+            if cell in closed or -neg_g != g_scores[cell]:
+                continue
+            closed.add(cell)
+            row = cell // columns
+            column = cell - row * columns
+            explored.append(self.get_node(row, column))
+            if cell == dest:
+                break
+
+            parent = parents[cell]
+            if parent == -1:
+                row_step = column_step = 0
+            else:
+                parent_row = parent // columns
+                row_step = (row > parent_row) - (row < parent_row)
+                column_step = (column > parent - parent_row * columns) - (
+                    column < parent - parent_row * columns
+                )
+            for direction in self._jump_directions(
+                row, column, row_step, column_step, allow_diagonal
+            ):
+                jump_point = self._jump(
+                    row,
+                    column,
+                    direction[0],
+                    direction[1],
+                    dest,
+                    allow_diagonal,
+                    transposed,
+                )
+                if jump_point == -1 or jump_point in closed:
+                    continue
+                jump_row = jump_point // columns
+                jump_column = jump_point - jump_row * columns
+                row_diff = abs(jump_row - row)
+                column_diff = abs(jump_column - column)
+                # Jumps follow a straight or diagonal line, so this is the number of steps
+                new_g = -neg_g + (row_diff if row_diff > column_diff else column_diff)
+                if new_g < g_scores.get(jump_point, new_g + 1):
+                    g_scores[jump_point] = new_g
+                    parents[jump_point] = cell
+                    row_diff = abs(jump_row - dest_row)
+                    column_diff = abs(jump_column - dest_column)
+                    if allow_diagonal:
+                        h = row_diff if row_diff > column_diff else column_diff
+                    else:
+                        h = row_diff + column_diff
+                    counter += 1
+                    heapq.heappush(to_explore, (new_g + h, -new_g, counter, jump_point))
+
+        if dest not in closed:
+            return None, explored
+        path = []
+        cell = dest
+        while parents[cell] != -1:
+            parent = parents[cell]
+            row, column = cell // columns, cell % columns
+            parent_row, parent_column = parent // columns, parent % columns
+            row_step = (parent_row > row) - (parent_row < row)
+            column_step = (parent_column > column) - (parent_column < column)
+            while (row, column) != (parent_row, parent_column):
+                path.append((row, column))
+                row += row_step
+                column += column_step
+            cell = parent
+        path.append((self.start_node.row, self.start_node.column))
+        # Return reversed path
+        return path[::-1], explored
+
+    def _is_free(self, row: int, column: int) -> bool:
+        """Checks if a position is inside the graph and isn't a wall.
+
+        Args:
+            row (int): The row to check.
+            column (int): The column to check.
+
+        Returns:
+            bool: True if the position can be walked on.
+        """
+        return (
+            0 <= row < self.rows
+            and 0 <= column < self.columns
+            and not self.occupancy[row * self.columns + column]
+        )
+
+    def _jump_directions(
+        self, row: int, column: int, row_step: int, column_step: int, allow_diagonal
+    ) -> list[tuple[int, int]]:
+        """Gets the directions Jump Point Search must follow from a jump point.
+        These are the natural directions, that continue the direction the jump point
+        was reached with, and the forced ones, that go around a wall.
+
+        Args:
+            row (int): The row of the jump point.
+            column (int): The column of the jump point.
+            row_step (int): The row direction the jump point was reached with.
+            column_step (int): The column direction the jump point was reached with.
+            Both are 0 for the starting Node.
+            allow_diagonal (bool): The flag that tells if diagonal movement is allowed.
+
+        Returns:
+            list[tuple[int, int]]: The (row_step, column_step) directions to jump in.
+        """
+        is_free = self._is_free
+        if row_step == 0 and column_step == 0:
+            return list(DIAGONAL_OFFSETS if allow_diagonal else STRAIGHT_OFFSETS)
+        if not allow_diagonal:
+            if row_step:
+                return [(row_step, 0), (0, -1), (0, 1)]
+            directions = [(0, column_step)]
+            for side in (-1, 1):
+                if not is_free(row + side, column - column_step) and is_free(
+                    row + side, column
+                ):
+                    directions.append((side, 0))
+            return directions
+        if row_step and column_step:
+            directions = [(row_step, 0), (0, column_step), (row_step, column_step)]
+            if not is_free(row - row_step, column):
+                directions.append((-row_step, column_step))
+            if not is_free(row, column - column_step):
+                directions.append((row_step, -column_step))
+            return directions
+        if row_step:
+            directions = [(row_step, 0)]
+            for side in (-1, 1):
+                if not is_free(row, column + side):
+                    directions.append((row_step, side))
+            return directions
+        directions = [(0, column_step)]
+        for side in (-1, 1):
+            if not is_free(row + side, column):
+                directions.append((side, column_step))
+        return directions
+
+    def _jump(
+        self,
+        row: int,
+        column: int,
+        row_step: int,
+        column_step: int,
+        dest: int,
+        allow_diagonal,
+        transposed: bytes = None,
+    ) -> int:
+        """Moves from a cell in the given direction until it reaches a jump point.
+        Straight jumps are searched with Graph._scan_row instead of one cell at a time,
+        vertical ones in the transposed occupancy when diagonal movement is allowed.
+
+        Args:
+            row (int): The row of the cell to jump from.
+            column (int): The column of the cell to jump from.
+            row_step (int): The row direction of the jump.
+            column_step (int): The column direction of the jump.
+            dest (int): The cell id of the goal Node.
+            allow_diagonal (bool): The flag that tells if diagonal movement is allowed.
+            transposed (bytes, optional): The occupancy of the graph column by column,
+            needed with diagonal movement. Defaults to None.
+
+        Returns:
+            int: The cell id of the jump point, -1 if the jump hits a wall or the border.
+        """
+        columns = self.columns
+        if not (
+            0 <= row + row_step < self.rows
+            and 0 <= column + column_step < columns
+            and not self.occupancy[(row + row_step) * columns + column + column_step]
+        ):
+            return -1
+        dest_row, dest_column = divmod(dest, columns)
+        if not row_step:
+            found = self._scan_row(
+                self.occupancy,
+                self.rows,
+                columns,
+                row,
+                column,
+                column_step,
+                dest_column if dest_row == row else -1,
+                allow_diagonal,
+            )
+            return -1 if found == -1 else row * columns + found
+        if not column_step and allow_diagonal:
+            found = self._scan_row(
+                transposed,
+                columns,
+                self.rows,
+                column,
+                row,
+                row_step,
+                dest_row if dest_column == column else -1,
+                True,
+            )
+            return -1 if found == -1 else found * columns + column
+        is_free = self._is_free
+        while True:
+            row += row_step
+            column += column_step
+            if not is_free(row, column):
+                return -1
+            cell = row * columns + column
+            if cell == dest:
+                return cell
+            if not allow_diagonal:
+                # Vertical jumps stop where a horizontal jump would find something
+                if (
+                    self._jump(row, column, 0, 1, dest, False) != -1
+                    or self._jump(row, column, 0, -1, dest, False) != -1
+                ):
+                    return cell
+                continue
+            if (
+                not is_free(row - row_step, column)
+                and is_free(row - row_step, column + column_step)
+            ) or (
+                not is_free(row, column - column_step)
+                and is_free(row + row_step, column - column_step)
+            ):
+                return cell
+            if (
+                self._jump(row, column, row_step, 0, dest, True, transposed) != -1
+                or self._jump(row, column, 0, column_step, dest, True) != -1
+            ):
+                return cell
+
+    @staticmethod
+    def _scan_row(
+        occupancy,
+        rows: int,
+        columns: int,
+        row: int,
+        column: int,
+        column_step: int,
+        dest_column: int,
+        allow_diagonal,
+    ) -> int:
+        """Moves from a cell along its row until it reaches a jump point. Instead of
+        checking one cell at a time, the row is searched with bytes.find for its next
+        wall, and the rows above and below for the next end of a wall, which is where
+        a path can turn.
+
+        Args:
+            occupancy (bytes): The occupancy of the grid, see Graph.occupancy.
+            rows (int): The number of rows of the grid.
+            columns (int): The number of columns of the grid.
+            row (int): The row of the cell to jump from.
+            column (int): The column of the cell to jump from.
+            column_step (int): The column direction of the jump, 1 or -1.
+            dest_column (int): The column of the goal Node if it is in the row,
+            -1 otherwise.
+            allow_diagonal (bool): The flag that tells if diagonal movement is allowed.
+
+        Returns:
+            int: The column of the jump point, -1 if the jump hits a wall or the border.
+        """
+        first = row * columns
+        # The first cells of the rows above and below
+        sides = []
+        if row > 0:
+            sides.append(first - columns)
+        if row < rows - 1:
+            sides.append(first + columns)
+        if column_step > 0:
+            wall = occupancy.find(1, first + column + 1, first + columns)
+            # The first column the jump can't reach, and the closest jump point so far
+            end = found = columns if wall == -1 else wall - first
+            if column < dest_column < end:
+                found = dest_column
+            for side in sides:
+                # A wall of the row above or below that ends before the jump point
+                if allow_diagonal:
+                    corner = occupancy.find(
+                        b"\x01\x00",
+                        side + column + 1,
+                        side + (found + 1 if found < columns else columns),
+                    )
+                else:
+                    corner = occupancy.find(b"\x01\x00", side + column, side + found)
+                    if corner != -1:
+                        corner += 1
+                if corner != -1:
+                    found = corner - side
+        else:
+            wall = occupancy.rfind(1, first, first + column)
+            end = found = -1 if wall == -1 else wall - first
+            if end < dest_column < column:
+                found = dest_column
+            for side in sides:
+                if allow_diagonal:
+                    corner = occupancy.rfind(
+                        b"\x00\x01", side + max(found, 0), side + column
+                    )
+                    if corner != -1:
+                        corner += 1
+                else:
+                    corner = occupancy.rfind(
+                        b"\x00\x01", side + found + 1, side + column + 1
+                    )
+                if corner != -1:
+                    found = corner - side
+        return -1 if found == end else found
+
+    def bidirectional_a_star_algo(self, allow_diagonal=True) -> list[tuple[int, int]]:
+        """Uses two a star searches at once, one from the starting Node towards the goal
+        Node and one from the goal Node towards the starting Node, to find the shortest
+        path between them. Each step expands the search that has expanded the fewest
+        Nodes so far. Every time a search reaches a Node the other one has reached,
+        the path through that Node becomes a candidate.
+
+        Both searches use the same balanced heuristic: half the difference between
+        the distance to the goal Node and the distance to the starting Node (negated
+        for the search from the goal). It is consistent in both directions, so the
+        searches can stop as soon as the sum of their lowest priorities reaches twice
+        the best candidate, which happens when they meet halfway. Priorities are
+        doubled to stay integers.
+        See https://www.cs.princeton.edu/courses/archive/spr06/cos423/Handouts/EPP%20shortest%20path%20algorithms.pdf
+
+        Args:
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+
+        Returns:
+            list[tuple[int, int]]: The list of positions of all Nodes in the shortest path.
+            The explored Nodes are those expanded by both searches, in order.
+        """
+        columns = self.columns
+        start_row = self.start_node.row
+        start_column = self.start_node.column
+        dest_row = self.dest_node.row
+        dest_column = self.dest_node.column
+        start = start_row * columns + start_column
+        dest = dest_row * columns + dest_column
+        if self.occupancy[start] or self.occupancy[dest]:
+            return None, []
+        if allow_diagonal:
+            row_diff = abs(start_row - dest_row)
+            column_diff = abs(start_column - dest_column)
+            distance = row_diff if row_diff > column_diff else column_diff
+        else:
+            distance = abs(start_row - dest_row) + abs(start_column - dest_column)
+
+        # Index 0 is the search from the start, index 1 the search from the goal
+        g_scores = ({start: 0}, {dest: 0})
+        parents = ({start: -1}, {dest: -1})
+        closed = (set(), set())
+        to_explore = ([(distance, 0, 0, start)], [(distance, 0, 0, dest)])
+        explored = []
+        counter = 0
+        best_cost = 0 if start == dest else None
+        meeting_cell = start
+
+        while True:
+            for side in (0, 1):
+                heap = to_explore[side]
+                # Drop the entries superseded by a better g or already expanded
+                while heap and (
+                    heap[0][3] in closed[side]
+                    or -heap[0][1] != g_scores[side][heap[0][3]]
+                ):
+                    heapq.heappop(heap)
+            if not to_explore[0] or not to_explore[1]:
+                break
+            if (
+                best_cost is not None
+                and to_explore[0][0][0] + to_explore[1][0][0] >= 2 * best_cost
+            ):
+                break
+
+            side = 0 if len(closed[0]) <= len(closed[1]) else 1
+            _, neg_g, _, cell = heapq.heappop(to_explore[side])
+            closed[side].add(cell)
+            row = cell // columns
+            explored.append(self.get_node(row, cell - row * columns))
+            own_g = g_scores[side]
+            other_g = g_scores[1 - side]
+            new_g = 1 - neg_g
+            for neighbour in self.neighbour_cells(cell, allow_diagonal):
+                if neighbour in closed[side] or new_g >= own_g.get(
+                    neighbour, new_g + 1
+                ):
+                    continue
+                own_g[neighbour] = new_g
+                parents[side][neighbour] = cell
+                if neighbour in other_g:
+                    cost = new_g + other_g[neighbour]
+                    if best_cost is None or cost < best_cost:
+                        best_cost = cost
+                        meeting_cell = neighbour
+                neighbour_row = neighbour // columns
+                neighbour_column = neighbour - neighbour_row * columns
+                if allow_diagonal:
+                    row_diff = abs(neighbour_row - dest_row)
+                    column_diff = abs(neighbour_column - dest_column)
+                    to_dest = row_diff if row_diff > column_diff else column_diff
+                    row_diff = abs(neighbour_row - start_row)
+                    column_diff = abs(neighbour_column - start_column)
+                    to_start = row_diff if row_diff > column_diff else column_diff
+                else:
+                    to_dest = abs(neighbour_row - dest_row) + abs(
+                        neighbour_column - dest_column
+                    )
+                    to_start = abs(neighbour_row - start_row) + abs(
+                        neighbour_column - start_column
+                    )
+                if side == 0:
+                    priority = 2 * new_g + to_dest - to_start
+                else:
+                    priority = 2 * new_g + to_start - to_dest
+                counter += 1
+                heapq.heappush(to_explore[side], (priority, -new_g, counter, neighbour))
+
+        if best_cost is None:
+            return None, explored
+        path = []
+        cell = meeting_cell
+        while cell != -1:
+            path.append((cell // columns, cell % columns))
+            cell = parents[0][cell]
+        path.reverse()
+        cell = parents[1][meeting_cell]
+        while cell != -1:
+            path.append((cell // columns, cell % columns))
+            cell = parents[1][cell]
+        return path, explored
+
+    def anytime_a_star_algo(
+        self,
+        allow_diagonal=True,
+        time_limit: float = None,
+        max_expansions: int = None,
+        epsilon: float = 2,
+        epsilon_step: float = 0.5,
+        heuristic=None,
+    ) -> list[tuple[int, int]]:
+        """Uses an anytime repairing a star search (ARA*) to find a path between the
+        starting Node and the goal Node within a budget.
+        See https://papers.nips.cc/paper/2382-ara-anytime-a-with-provable-bounds-on-sub-optimality
+
+        The first pass is a weighted a star search with the given epsilon (see
+        Graph.a_star_algo), which finds a path quickly. Each following pass lowers
+        epsilon by epsilon_step and improves the path, reusing the g values of the
+        previous passes: only the Nodes whose g got better since they were expanded
+        are expanded again. The last pass, with an epsilon of 0, finds the shortest
+        path.
+
+        The search stops when the shortest path is found, when time_limit seconds
+        have passed or after max_expansions expansions. The best path found so far
+        is returned, Graph.last_suboptimality bounds how much longer than the
+        shortest path it is and Graph.last_status tells if the budget ran out
+        (BUDGET_EXHAUSTED, with or without a path) or not (FOUND, or NO_PATH when
+        there is no path at all).
+
+        Args:
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+            time_limit (float, optional): The number of seconds the search may take.
+            Defaults to None (no limit).
+            max_expansions (int, optional): The number of expansions the search may
+            make. Defaults to None (no limit).
+            epsilon (float, optional): The epsilon of the first pass. Defaults to 2.
+            epsilon_step (float, optional): How much epsilon is lowered after each
+            pass. Defaults to 0.5.
+            heuristic (callable, optional): A function giving a lower bound of the
+            distance between two cells from their ids, see Graph.a_star_algo.
+            Defaults to None (Manhattan or Chebyshev distance).
+
+        Returns:
+            list[tuple[int, int]]: The list of positions of all Nodes in the best path
+            found. The explored Nodes are those expanded by any pass, in order.
+        """
+        if epsilon < 0:
+            raise ValueError(f"epsilon can't be negative, got {epsilon}")
+        if epsilon_step <= 0:
+            raise ValueError(f"epsilon_step must be positive, got {epsilon_step}")
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        columns = self.columns
+        occupancy = self.occupancy
+        dest_row = self.dest_node.row
+        dest_column = self.dest_node.column
+        start = self.start_node.row * columns + self.start_node.column
+        dest = dest_row * columns + dest_column
+        self.last_suboptimality = None
+        self.last_status = NO_PATH
+        if occupancy[start] or occupancy[dest]:
+            return None, []
+
+        h_scores = {}
+
+        def estimate(cell: int) -> int:
+            h = h_scores.get(cell)
+            if h is None:
+                if heuristic is not None:
+                    h = heuristic(cell, dest)
+                else:
+                    row_diff = abs(cell // columns - dest_row)
+                    column_diff = abs(cell % columns - dest_column)
+                    if allow_diagonal:
+                        h = row_diff if row_diff > column_diff else column_diff
+                    else:
+                        h = row_diff + column_diff
+                h_scores[cell] = h
+            return h
+
+        weight = 1 + epsilon
+        g_scores = {start: 0}
+        parents = {start: -1}
+        # The cells waiting in the heap, and the improved cells already expanded in
+        # this pass, which wait for the next one
+        waiting = {start}
+        inconsistent = set()
+        closed = set()
+        to_explore = [(weight * estimate(start), 0, 0, start)]
+        counter = 0
+        expansions = 0
+        explored_cells = {}
+        while True:
+            exhausted = False
+            while to_explore:
+                f, neg_g, _, cell = to_explore[0]
+                if cell not in waiting or -neg_g != g_scores[cell]:
+                    heapq.heappop(to_explore)
+                    continue
+                if g_scores.get(dest, f + 1) <= f:
+                    break
+                if (max_expansions is not None and expansions >= max_expansions) or (
+                    deadline is not None and time.perf_counter() >= deadline
+                ):
+                    exhausted = True
+                    break
+                heapq.heappop(to_explore)
+                waiting.discard(cell)
+                closed.add(cell)
+                expansions += 1
+                explored_cells[cell] = None
+                new_g = 1 - neg_g
+                for neighbour in self.neighbour_cells(cell, allow_diagonal):
+                    if new_g >= g_scores.get(neighbour, new_g + 1):
+                        continue
+                    g_scores[neighbour] = new_g
+                    parents[neighbour] = cell
+                    if neighbour in closed:
+                        inconsistent.add(neighbour)
+                    else:
+                        waiting.add(neighbour)
+                        counter += 1
+                        heapq.heappush(
+                            to_explore,
+                            (
+                                new_g + weight * estimate(neighbour),
+                                -new_g,
+                                counter,
+                                neighbour,
+                            ),
+                        )
+
+            # Every path to the goal still goes through a waiting cell, whose g + h
+            # bounds the length of the shortest path from below
+            lower_bound = min(
+                (g_scores[cell] + estimate(cell) for cell in waiting | inconsistent),
+                default=None,
+            )
+            if dest in g_scores:
+                path = []
+                cell = dest
+                while cell != -1:
+                    path.append((cell // columns, cell % columns))
+                    cell = parents[cell]
+                path.reverse()
+                cost = len(path) - 1
+                self.last_suboptimality = 1.0
+                if lower_bound is not None and lower_bound < cost:
+                    self.last_suboptimality = cost / lower_bound
+            else:
+                path = None
+            if exhausted:
+                self.last_status = BUDGET_EXHAUSTED
+            elif path is not None:
+                self.last_status = FOUND
+            if exhausted or path is None or self.last_suboptimality == 1.0:
+                break
+            # Next pass: lower epsilon and requeue every cell that may improve
+            epsilon = max(epsilon - epsilon_step, 0)
+            weight = 1 + epsilon
+            waiting |= inconsistent
+            inconsistent = set()
+            closed = set()
+            to_explore = []
+            for cell in waiting:
+                g = g_scores[cell]
+                counter += 1
+                to_explore.append((g + weight * estimate(cell), -g, counter, cell))
+            heapq.heapify(to_explore)
+
+        explored = [
+            self.get_node(cell // columns, cell % columns) for cell in explored_cells
+        ]
+        return path, explored
+
+    def neighbour_cells(self, cell: int, allow_diagonal=True) -> list[int]:
+        """Gets the ids of the cells that can be reached from a cell with only one step.
+        Walls are left out. The cells come in the same order as Graph.get_neighbours.
+
+        Args:
+            cell (int): The id of the cell (row * columns + column).
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed.
+            Defaults to True.
+
+        Returns:
+            list[int]: The ids of all neighbouring cells that aren't walls.
+        """
+        rows = self.rows
+        columns = self.columns
+        occupancy = self.occupancy
+        row = cell // columns
+        column = cell - row * columns
+        list_neighbours = []
+        for row_offset, column_offset in (
+            DIAGONAL_OFFSETS if allow_diagonal else STRAIGHT_OFFSETS
+        ):
+            neighbour_row = row + row_offset
+            neighbour_column = column + column_offset
+            if 0 <= neighbour_row < rows and 0 <= neighbour_column < columns:
+                neighbour = neighbour_row * columns + neighbour_column
+                if not occupancy[neighbour]:
+                    list_neighbours.append(neighbour)
+        return list_neighbours
+
+    def distance_map(
+        self, row: int, column: int, allow_diagonal=True, region: tuple = None
+    ) -> array:
+        """Computes the number of steps from every cell to the given cell
+        with a breadth first search.
+
+        Args:
+            row (int): The row of the cell to measure the distances to.
+            column (int): The column of the cell to measure the distances to.
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed.
+            Defaults to True.
+            region (tuple, optional): The (top, left, bottom, right) bounds of the
+            cells to search, bottom and right excluded. The paths can't leave it.
+            Defaults to None (the whole graph).
+
+        Raises:
+            ValueError: If the region isn't inside the graph or doesn't contain
+            the given cell.
+
+        Returns:
+            array: The distance of every cell, indexed by cell id.
+            -1 for walls, cells outside of the region and cells that can't reach
+            the given cell.
+        """
+        region = self._check_region(row, column, region)
+        return breadth_first_distances(
+            self.occupancy,
+            self.rows,
+            self.columns,
+            [row * self.columns + column],
+            allow_diagonal,
+            region,
+        )
+
+    def _check_region(self, row: int, column: int, region: tuple) -> tuple:
+        """Checks the bounds of the region of a distance map.
+
+        Args:
+            row (int): The row of the cell the distances are measured to.
+            column (int): The column of the cell the distances are measured to.
+            region (tuple): The (top, left, bottom, right) bounds of the region,
+            None for the whole graph.
+
+        Raises:
+            ValueError: If the region isn't inside the graph or doesn't contain
+            the cell.
+
+        Returns:
+            tuple: The bounds of the region.
+        """
+        if region is None:
+            return (0, 0, self.rows, self.columns)
+        top, left, bottom, right = region
+        if not (0 <= top < bottom <= self.rows and 0 <= left < right <= self.columns):
+            raise ValueError(f"The region {region} isn't inside the graph")
+        if not (top <= row < bottom and left <= column < right):
+            raise ValueError(f"The region {region} doesn't contain {(row, column)}")
+        return (top, left, bottom, right)
+
+    def flow_field(
+        self, row: int, column: int, allow_diagonal=True, region: tuple = None
+    ) -> array:
+        """Computes the number of steps from every cell to the given cell, so that
+        any number of agents can walk to it with Graph.next_step or
+        Graph.follow_distance_map, in a time proportional to the length of their
+        path, instead of searching once per agent.
+
+        With NumPy, the wavefront of the breadth first search is expanded with array
+        operations, see wavefront. Without NumPy, this is Graph.distance_map.
+
+        Args:
+            row (int): The row of the goal cell.
+            column (int): The column of the goal cell.
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+            region (tuple, optional): The (top, left, bottom, right) bounds of the
+            cells to search, bottom and right excluded. Defaults to None
+            (the whole graph).
+
+        Raises:
+            ValueError: If the region isn't inside the graph or doesn't contain
+            the goal cell.
+
+        Returns:
+            array: The distance of every cell, indexed by cell id, see
+            Graph.distance_map.
+        """
+        region = self._check_region(row, column, region)
+        return wavefront(
+            self.occupancy,
+            self.rows,
+            self.columns,
+            [row * self.columns + column],
+            allow_diagonal,
+            region,
+        )
+
+    def next_step(
+        self, distances: array, row: int, column: int, allow_diagonal=True
+    ) -> tuple[int, int]:
+        """Gets the next cell on a shortest path from a cell to the cell a distance
+        map was computed for.
+
+        Args:
+            distances (array): The distance map, see Graph.flow_field.
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. It must be the one used for the distance map.
+            Defaults to True.
+
+        Returns:
+            tuple[int, int]: The position of the next cell, None if the cell is
+            the goal cell or can't reach it.
+        """
+        cell = row * self.columns + column
+        distance = distances[cell]
+        if distance <= 0:
+            return None
+        for neighbour in self.neighbour_cells(cell, allow_diagonal):
+            if distances[neighbour] == distance - 1:
+                return divmod(neighbour, self.columns)
+        return None
+
+    def follow_distance_map(
+        self, distances: array, row: int, column: int, allow_diagonal=True
+    ) -> list[tuple[int, int]]:
+        """Follows a distance map from a cell down to the cell it was computed for.
+
+        Args:
+            distances (array): The distance map, see Graph.distance_map.
+            row (int): The row of the cell to start from.
+            column (int): The column of the cell to start from.
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. It must be the one used for the distance map.
+            Defaults to True.
+
+        Returns:
+            list[tuple[int, int]]: The positions of the shortest path,
+            None if the cell can't reach the end of the distance map.
+        """
+        columns = self.columns
+        cell = row * columns + column
+        if distances[cell] == -1:
+            return None
+        path = [(row, column)]
+        while distances[cell] > 0:
+            for neighbour in self.neighbour_cells(cell, allow_diagonal):
+                if distances[neighbour] == distances[cell] - 1:
+                    cell = neighbour
+                    break
+            path.append((cell // columns, cell % columns))
+        return path
+
+    def label_components(self, allow_diagonal=True) -> array:
+        """Labels the connected areas of the graph with a flood fill. Two cells
+        have the same label if and only if there is a path between them.
+
+        Args:
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed.
+            Defaults to True.
+
+        Returns:
+            array: The label of every cell, indexed by cell id. 0 for walls.
+        """
+        occupancy = self.occupancy
+        if occupancy.find(1) == -1:
+            # Without walls, every cell is in the same area
+            return array("i", [1]) * (self.rows * self.columns)
+        labels = array("i", [0]) * (self.rows * self.columns)
+        label = 0
+        for origin, occupied in enumerate(occupancy):
+            if occupied or labels[origin]:
+                continue
+            label += 1
+            labels[origin] = label
+            frontier = [origin]
+            while frontier:
+                cell = frontier.pop()
+                for neighbour in self.neighbour_cells(cell, allow_diagonal):
+                    if not labels[neighbour]:
+                        labels[neighbour] = label
+                        frontier.append(neighbour)
+        return labels
+
+    def find_paths(
+        self,
+        pairs,
+        allow_diagonal=True,
+        chunk_size: int = 1024,
+        group_size: int = 8,
+        components=None,
+    ):
+        """Finds the shortest paths of many (start, dest) pairs on this graph.
+
+        The connected areas of the graph are labelled once, or read from a
+        components.ComponentIndex, so pairs that can't be joined are answered without
+        searching. The pairs are read by chunks and
+        grouped by destination: a destination shared by at least group_size pairs
+        gets one distance map that all of them follow, the other pairs are solved
+        with Graph.a_star_algo. The starting and goal Nodes of the graph are left as
+        they were.
+
+        Args:
+            pairs: An iterable of ((start_row, start_column), (dest_row, dest_column)).
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+            chunk_size (int, optional): The number of pairs read before they are solved.
+            Defaults to 1024.
+            group_size (int, optional): The number of pairs sharing a destination from
+            which a distance map is used. Defaults to 8.
+            components (components.ComponentIndex, optional): An index of the
+            connected areas of the graph for the same movement mode, used instead of
+            labelling them again. Defaults to None.
+
+        Yields:
+            tuple: (start, dest, path) for every pair, grouped by destination within
+            each chunk. path is the list of positions of the shortest path,
+            None if there is none.
+        """
+        if components is None:
+            component = self.label_components(allow_diagonal).__getitem__
+        elif components.allow_diagonal != allow_diagonal:
+            raise ValueError("The component index was built for another movement mode")
+        else:
+            component = components.component
+        chunk = []
+        for pair in pairs:
+            chunk.append(pair)
+            if len(chunk) < chunk_size:
+                continue
+            yield from self._solve_chunk(chunk, component, allow_diagonal, group_size)
+            chunk = []
+        if chunk:
+            yield from self._solve_chunk(chunk, component, allow_diagonal, group_size)
+
+    def _solve_chunk(self, chunk: list, component, allow_diagonal, group_size: int):
+        """Solves one chunk of Graph.find_paths.
+
+        Args:
+            chunk (list): The (start, dest) pairs to solve.
+            component (callable): The function giving the connected area of a cell,
+            0 for walls.
+            allow_diagonal (bool): The flag that tells if diagonal movement is allowed.
+            group_size (int): The number of pairs sharing a destination from
+            which a distance map is used.
+
+        Yields:
+            tuple: (start, dest, path) for every pair of the chunk.
+        """
+        columns = self.columns
+        groups = {}
+        for start, dest in chunk:
+            groups.setdefault(tuple(dest), []).append(tuple(start))
+        for dest, starts in groups.items():
+            dest_label = component(dest[0] * columns + dest[1])
+            reachable = {
+                start
+                for start in starts
+                if dest_label and component(start[0] * columns + start[1]) == dest_label
+            }
+            distances = None
+            if len(reachable) >= group_size:
+                distances = self.distance_map(dest[0], dest[1], allow_diagonal)
+            for start in starts:
+                if start not in reachable:
+                    path = None
+                elif distances is not None:
+                    path = self.follow_distance_map(
+                        distances, start[0], start[1], allow_diagonal
+                    )
+                else:
+                    saved_start_node = self.start_node
+                    saved_dest_node = self.dest_node
+                    self.set_start_node(start[0], start[1])
+                    self.set_dest_node(dest[0], dest[1])
+                    try:
+                        path, _ = self.a_star_algo(allow_diagonal)
+                    finally:
+                        self.start_node = saved_start_node
+                        self.dest_node = saved_dest_node
+                yield start, dest, path
+
+
+class ArrayGraph(Graph):
+    """This class represents a maze stored in flat buffers indexed by cell id
+    (row * columns + column) instead of rows of Node objects. Nodes are only
+    created when they are asked for, which keeps very large maps cheap to build.
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        columns: int,
+        start_node: Node = None,
+        dest_node: Node = None,
+        occupancy=None,
+    ) -> None:
+        """Creates an ArrayGraph of given size, optionally filled with the given walls.
+
+        Attributes:
+            start_node (Node, optional): The starting Node for the algorithm.
+            dest_node (Node, optional): The goal Node for the algorithm.
+            rows (int): The number of rows of the graph.
+            columns (int): The number of columns of the graph.
+            occupancy (bytearray): One byte per cell, set to 1 when the cell is a wall.
+            generation (int): The number of searches run on the graph.
+            g_scores (array): The g value of every cell reached by a search.
+            f_scores (array): The f value of every cell reached by a search,
+            without the weight of a weighted search.
+            parents (array): The parent cell id of every cell reached by a search,
+            -1 for the starting cell.
+            generations (array): The search that last reached each cell. The scores and
+            parent of a cell are only valid if this is the graph's generation.
+            closed_generations (array): The search that last explored each cell.
+            version (int): The number of wall changes made to the graph.
+            last_suboptimality (float): A bound on the ratio between the length of
+            the last path found by a_star_algo or anytime_a_star_algo and the
+            shortest one, None if no path was found.
+            last_status (str): The outcome of the last search run by a_star_algo or
+            anytime_a_star_algo: FOUND, NO_PATH or BUDGET_EXHAUSTED.
+            last_result (weakref.ref): A weak reference to the SearchResult of the
+            last search run by a_star_algo, None before the first one.
+            listeners (list): The functions called with (row, column, is_wall)
+            every time a cell becomes a wall or stops being one.
+
+        Args:
+            rows (int): The number of rows of the graph.
+            columns (int): The number of columns of the graph.
+            start_node (Node, optional): The starting Node for the algorithm.
+            Defaults to None.
+            dest_node (Node, optional): The goal Node for the algorithm.
+            Defaults to None.
+            occupancy (optional): The walls of the graph, either as rows of booleans,
+            a flat sequence of rows * columns booleans or a 2D NumPy array.
+            Defaults to None (no walls).
+
+        Raises:
+            ValueError: If the occupancy doesn't contain rows * columns cells.
+        """
+        self.start_node: Node = start_node
+        self.dest_node: Node = dest_node
+        self.rows = rows
+        self.columns = columns
+        self.generation = 0
+        self.version = 0
+        self.last_suboptimality = None
+        self.last_status = None
+        self.last_result = None
+        self.listeners = []
+        if occupancy is None:
+            self.occupancy = bytearray(rows * columns)
+        else:
+            self.occupancy = to_occupancy(occupancy)
+            if len(self.occupancy) != rows * columns:
+                raise ValueError(
+                    "The occupancy has %d cells instead of %d"
+                    % (len(self.occupancy), rows * columns)
+                )
+        # The search buffers are allocated by the first search
+        self.g_scores = None
+        self.f_scores = None
+        self.parents = None
+        self.generations = None
+        self.closed_generations = None
+
+    @classmethod
+    def from_occupancy(cls, occupancy) -> "ArrayGraph":
+        """Creates an ArrayGraph whose size is taken from a 2D occupancy grid.
+
+        Args:
+            occupancy: The walls of the graph as rows of booleans or a 2D NumPy array.
+
+        Returns:
+            ArrayGraph: The graph containing the given walls.
+        """
+        if hasattr(occupancy, "shape"):
+            rows, columns = occupancy.shape
+        else:
+            occupancy = list(occupancy)
+            rows = len(occupancy)
+            columns = len(occupancy[0]) if rows else 0
+        return cls(rows, columns, occupancy=occupancy)
+
+    @property
+    def walls(self) -> list[Node]:
+        """list[Node]: The list of all walls, ordered by cell id."""
+        columns = self.columns
+        return [
+            self.get_node(cell // columns, cell % columns)
+            for cell, occupied in enumerate(self.occupancy)
+            if occupied
+        ]
+
+    def add_wall(self, row: int, column: int) -> None:
+        """Marks the cell at the given row and column as a wall.
+        Adding the same wall twice has no effect.
+
+        Args:
+            row (int): The row of the wall.
+            column (int): The column of the wall.
+        """
+        cell = self._cell(row, column)
+        if not self.occupancy[cell]:
+            self.occupancy[cell] = 1
+            self.version += 1
+            self.notify_listeners(row, column, True)
+
+    def remove_wall(self, row: int, column: int) -> None:
+        """Marks the cell at the given row and column as free.
+        Removing a cell that is not a wall has no effect.
+
+        Args:
+            row (int): The row of the wall.
+            column (int): The column of the wall.
+        """
+        cell = self._cell(row, column)
+        if self.occupancy[cell]:
+            self.occupancy[cell] = 0
+            self.version += 1
+            self.notify_listeners(row, column, False)
+
+    def get_neighbours(self, current_node: Node, allow_diagonal=True) -> list[Node]:
+        """Gets all Nodes accessible to the current Node with only one step.
+        See Graph.get_neighbours.
+
+        Args:
+            current_node (Node): The Node from which we must obtain all neighbours.
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed.
+            Defaults to True.
+
+        Returns:
+            list[Node]: The list of all neighbouring Nodes of the current Node.
+        """
+        row = current_node.row
+        column = current_node.column
+        offsets = DIAGONAL_OFFSETS if allow_diagonal else STRAIGHT_OFFSETS
+        return [
+            self.get_node(row + row_offset, column + column_offset)
+            for row_offset, column_offset in offsets
+            if 0 <= row + row_offset < self.rows
+            and 0 <= column + column_offset < self.columns
+        ]
+
+    def get_node(self, row: int, column: int) -> Node:
+        """Creates a Node view of the cell at the given row and column.
+        Its g, h and f values are those of the last search, if it reached the cell.
+
+        Args:
+            row (int): The row of the Node to get.
+            column (int): The column of the Node to get.
+
+        Returns:
+            Node: The Node at the given row and column.
+
+        Raises:
+            IndexError: If the row or column is bigger than the Graph's
+            row or columns or is smaller than 0.
+        """
+        cell = self._cell(row, column)
+        node = Node(row=row, column=column, parent=None, cell=cell)
+        if self.generations is not None and self.generations[cell] == self.generation:
+            node.g = self.g_scores[cell]
+            node.f = self.f_scores[cell]
+            node.h = node.f - node.g
+        return node
+
+    def trace_path(self, cell: int) -> list[tuple[int, int]]:
+        """Follows the parents left by the last search from a cell back to the
+        starting Node. See Graph.trace_path.
+
+        Args:
+            cell (int): The id of a cell reached by the last search.
+
+        Returns:
+            list[tuple[int, int]]: The positions of the Nodes from the starting Node
+            to the cell.
+        """
+        columns = self.columns
+        parents = self.parents
+        path = []
+        while cell != -1:
+            path.append((cell // columns, cell % columns))
+            cell = parents[cell]
+        # Return reversed path
+        return path[::-1]
+
+    def a_star_algo(
+        self,
+        allow_diagonal=True,
+        heuristic=None,
+        epsilon: float = 0,
+        stats: SearchStats = None,
+        keep_explored=False,
+    ) -> SearchResult:
+        """Uses the a star algorithm to find the shortest path between
+        the starting Node and the goal Node. It explores the cells in the same order
+        as Graph.a_star_algo but only works on cell ids and flat buffers.
+        The buffers are reused by later searches thanks to the generations.
+
+        Args:
+            allow_diagonal (bool, optional): The flag that tells if
+            diagonal movement is allowed. Defaults to True.
+            heuristic (callable, optional): A function giving a lower bound of the
+            distance between two cells from their ids, see Graph.a_star_algo.
+            Defaults to None (Manhattan or Chebyshev distance).
+            epsilon (float, optional): How much longer than the shortest path the
+            path may be, see Graph.a_star_algo. Defaults to 0.
+            stats (SearchStats, optional): The stats to fill with the counters of
+            the search and whose callbacks to call. The time spent listing the
+            neighbours is the time of the neighbour loop minus the time of the
+            pushes. Defaults to None.
+            keep_explored (bool, optional): Whether to create a Node for every
+            explored cell and keep them in the result. Defaults to False.
+
+        Returns:
+            SearchResult: The cost and path of the shortest path, and the explored
+            cells, see Graph.a_star_algo.
+        """
+        if epsilon < 0:
+            raise ValueError(f"epsilon can't be negative, got {epsilon}")
+        weight = 1 + epsilon
+        self.last_suboptimality = None
+        self.last_status = NO_PATH
+        instrumented = stats is not None
+        if instrumented:
+            search_started = time.perf_counter()
+        rows = self.rows
+        columns = self.columns
+        size = rows * columns
+        occupancy = self.occupancy
+        if self.generations is None:
+            self.g_scores = array("i", [0]) * size
+            self.f_scores = array("i", [0]) * size
+            self.parents = array("i", [-1]) * size
+            self.generations = array("I", [0]) * size
+            self.closed_generations = array("I", [0]) * size
+        g_scores = self.g_scores
+        f_scores = self.f_scores
+        parents = self.parents
+        generations = self.generations
+        closed_generations = self.closed_generations
+        self.freeze_last_result()
+        self.generation += 1
+        generation = self.generation
+        offsets = DIAGONAL_OFFSETS if allow_diagonal else STRAIGHT_OFFSETS
+        start_row = self.start_node.row
+        start_column = self.start_node.column
+        dest_row = self.dest_node.row
+        dest_column = self.dest_node.column
+        start = start_row * columns + start_column
+        dest = dest_row * columns + dest_column
+
+        explored_cells = array("i")
+        row_diff = abs(start_row - dest_row)
+        column_diff = abs(start_column - dest_column)
+        if heuristic is not None:
+            h = heuristic(start, dest)
+        elif allow_diagonal:
+            h = row_diff if row_diff > column_diff else column_diff
+        else:
+            h = row_diff + column_diff
+        g_scores[start] = 0
+        f_scores[start] = h
+        parents[start] = -1
+        generations[start] = generation
+        to_explore = [(weight * h, 0, 0, start)]
+        if instrumented:
+            self._count_push(stats, start, 0, weight * h, 1)
+        counter = 0
+        # See Graph.a_star_algo
+        reopened_bound = math.inf
+        while to_explore:
+            _, neg_g, _, cell = heapq.heappop(to_explore)
+            if instrumented:
+                stats.pops += 1
+            # Lazy deletion: skip entries superseded by a better g or already expanded
+            if closed_generations[cell] == generation or -neg_g != g_scores[cell]:
+                continue
+            closed_generations[cell] = generation
+            explored_cells.append(cell)
+            if instrumented:
+                stats.expansions += 1
+                if stats.on_expand is not None:
+                    stats.on_expand(cell, -neg_g)
+            if cell == dest:
+                if instrumented and stats.on_goal is not None:
+                    stats.on_goal(cell, -neg_g)
+                break
+
+            new_g = 1 - neg_g
+            row = cell // columns
+            column = cell - row * columns
+            if instrumented:
+                listing_started = time.perf_counter()
+                pushing_time = 0.0
+            for row_offset, column_offset in offsets:
+                neighbour_row = row + row_offset
+                neighbour_column = column + column_offset
+                if not (0 <= neighbour_row < rows and 0 <= neighbour_column < columns):
+                    continue
+                neighbour = neighbour_row * columns + neighbour_column
+                if occupancy[neighbour]:
+                    continue
+                if generations[neighbour] != generation:
+                    generations[neighbour] = generation
+                elif closed_generations[neighbour] == generation:
+                    if epsilon and new_g < g_scores[neighbour]:
+                        # See Graph.a_star_algo: the cell isn't expanded again
+                        bound = new_g + f_scores[neighbour] - g_scores[neighbour]
+                        if bound < reopened_bound:
+                            reopened_bound = bound
+                    continue
+                elif new_g >= g_scores[neighbour]:
+                    continue
+                if instrumented:
+                    pushing_started = time.perf_counter()
+                if heuristic is not None:
+                    h = heuristic(neighbour, dest)
+                else:
+                    row_diff = abs(neighbour_row - dest_row)
+                    column_diff = abs(neighbour_column - dest_column)
+                    if allow_diagonal:
+                        h = row_diff if row_diff > column_diff else column_diff
+                    else:
+                        h = row_diff + column_diff
+                g_scores[neighbour] = new_g
+                f_scores[neighbour] = new_g + h
+                parents[neighbour] = cell
+                counter += 1
+                heapq.heappush(
+                    to_explore, (new_g + weight * h, -new_g, counter, neighbour)
+                )
+                if instrumented:
+                    self._count_push(
+                        stats, neighbour, new_g, new_g + weight * h, len(to_explore)
+                    )
+                    pushing_time += time.perf_counter() - pushing_started
+            if instrumented:
+                stats.neighbour_time += (
+                    time.perf_counter() - listing_started - pushing_time
+                )
+
+        explored = None
+        if keep_explored:
+            explored = [
+                self.get_node(cell // columns, cell % columns)
+                for cell in explored_cells
+            ]
+        if closed_generations[dest] != generation:
+            if instrumented:
+                stats.wall_time += time.perf_counter() - search_started
+            return self._new_result(NO_PATH, None, dest, explored_cells, explored)
+        self.last_status = FOUND
+        self.last_suboptimality = 1.0
+        if epsilon:
+            # See Graph.a_star_algo: the shortest path is at least the lowest g + h
+            # of the waiting cells and of the expanded cells reached with a better g
+            lower_bound = min(g_scores[dest], reopened_bound)
+            for _, neg_g, _, cell in to_explore:
+                if closed_generations[cell] != generation and -neg_g == g_scores[cell]:
+                    lower_bound = min(lower_bound, f_scores[cell])
+            if lower_bound:
+                self.last_suboptimality = g_scores[dest] / lower_bound
+        if instrumented:
+            stats.wall_time += time.perf_counter() - search_started
+        return self._new_result(FOUND, g_scores[dest], dest, explored_cells, explored)
+
+
+def to_occupancy(occupancy) -> bytearray:
+    """Converts walls given as booleans to a flat occupancy buffer.
+
+    Args:
+        occupancy: The walls as rows of booleans, a flat sequence of booleans
+        or a NumPy array.
+
+    Returns:
+        bytearray: One byte per cell, set to 1 when the cell is a wall.
+    """
+    if hasattr(occupancy, "astype"):
+        # NumPy arrays are converted without a Python loop over the cells
+        return bytearray(occupancy.astype(bool).astype("uint8").tobytes())
+    if isinstance(occupancy, (bytes, bytearray)):
+        return bytearray(1 if value else 0 for value in occupancy)
+    buffer = bytearray()
+    for line in occupancy:
+        if isinstance(line, (bool, int)):
+            buffer.append(1 if line else 0)
+        else:
+            buffer.extend(1 if value else 0 for value in line)
+    return buffer
+
+
+def wavefront(
+    occupancy: bytearray,
+    rows: int,
+    columns: int,
+    origins: list[int],
+    allow_diagonal=True,
+    region: tuple = None,
+) -> array:
+    """Computes the number of steps from every cell to the closest of the origin
+    cells, with NumPy if it is installed and breadth_first_distances otherwise.
+
+    The wavefront of the breadth first search is expanded with array operations, one
+    layer of cells at a time, on a copy of the region padded with walls so that no
+    bounds have to be checked. Layers narrower than VECTORISED_WAVEFRONT are expanded
+    in a Python loop over views of the same buffers.
+
+    Args:
+        occupancy (bytearray): One byte per cell, set to 1 when the cell is a wall.
+        rows (int): The number of rows of the grid.
+        columns (int): The number of columns of the grid.
+        origins (list[int]): The ids of the origin cells. Walls are left out.
+        allow_diagonal (bool, optional): The flag that tells if
+        diagonal movement is allowed. Defaults to True.
+        region (tuple, optional): The (top, left, bottom, right) bounds of the cells
+        to search, bottom and right excluded. The origins must be inside it.
+        Defaults to None (the whole grid).
+
+    Returns:
+        array: The distance of every cell, indexed by cell id. -1 for walls, cells
+        outside of the region and cells that can't reach any origin.
+    """
+    if numpy is None:
+        return breadth_first_distances(
+            occupancy, rows, columns, origins, allow_diagonal, region
+        )
+    top, left, bottom, right = region or (0, 0, rows, columns)
+    width = right - left + 2
+    grid = numpy.frombuffer(occupancy, dtype=numpy.uint8)
+    blocked = numpy.ones((bottom - top + 2, width), dtype=numpy.uint8)
+    blocked[1:-1, 1:-1] = grid.reshape(rows, columns)[top:bottom, left:right]
+    blocked = blocked.ravel()
+    padded_distances = numpy.full(blocked.size, -1, dtype=numpy.intc)
+    offsets = [
+        row_offset * width + column_offset
+        for row_offset, column_offset in (
+            DIAGONAL_OFFSETS if allow_diagonal else STRAIGHT_OFFSETS
+        )
+    ]
+    vector_offsets = numpy.array(offsets)
+    # Views of the same buffers, for the narrow wavefronts
+    blocked_cells = memoryview(blocked)
+    distance_cells = memoryview(padded_distances)
+    frontier = []
+    for origin in origins:
+        cell = (origin // columns - top + 1) * width + origin % columns - left + 1
+        if not blocked_cells[cell]:
+            blocked_cells[cell] = 1
+            distance_cells[cell] = 0
+            frontier.append(cell)
+    distance = 0
+    while len(frontier):
+        distance += 1
+        if len(frontier) < VECTORISED_WAVEFRONT:
+            next_frontier = []
+            for cell in list(frontier):
+                for offset in offsets:
+                    neighbour = cell + offset
+                    if not blocked_cells[neighbour]:
+                        blocked_cells[neighbour] = 1
+                        distance_cells[neighbour] = distance
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+            continue
+        neighbours = (numpy.asarray(frontier)[:, None] + vector_offsets).ravel()
+        frontier = numpy.unique(neighbours[blocked[neighbours] == 0])
+        blocked[frontier] = 1
+        padded_distances[frontier] = distance
+    distances = numpy.full((rows, columns), -1, dtype=numpy.intc)
+    distances[top:bottom, left:right] = padded_distances.reshape(-1, width)[1:-1, 1:-1]
+    result = array("i")
+    result.frombytes(distances.tobytes())
+    return result
+
+
+def breadth_first_distances(
+    occupancy: bytearray,
+    rows: int,
+    columns: int,
+    origins: list[int],
+    allow_diagonal=True,
+    region: tuple = None,
+) -> array:
+    """Computes the number of steps from every cell to the closest of the origin
+    cells with a breadth first search in pure Python. See wavefront.
+
+    Args:
+        occupancy (bytearray): One byte per cell, set to 1 when the cell is a wall.
+        rows (int): The number of rows of the grid.
+        columns (int): The number of columns of the grid.
+        origins (list[int]): The ids of the origin cells. Walls are left out.
+        allow_diagonal (bool, optional): The flag that tells if
+        diagonal movement is allowed. Defaults to True.
+        region (tuple, optional): The (top, left, bottom, right) bounds of the cells
+        to search, bottom and right excluded. The origins must be inside it.
+        Defaults to None (the whole grid).
+
+    Returns:
+        array: The distance of every cell, indexed by cell id. -1 for walls, cells
+        outside of the region and cells that can't reach any origin.
+    """
+    top, left, bottom, right = region or (0, 0, rows, columns)
+    offsets = DIAGONAL_OFFSETS if allow_diagonal else STRAIGHT_OFFSETS
+    distances = array("i", [-1]) * (rows * columns)
+    frontier = []
+    for origin in origins:
+        if not occupancy[origin] and distances[origin] == -1:
+            distances[origin] = 0
+            frontier.append(origin)
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for cell in frontier:
+            cell_row = cell // columns
+            cell_column = cell - cell_row * columns
+            for row_offset, column_offset in offsets:
+                neighbour_row = cell_row + row_offset
+                neighbour_column = cell_column + column_offset
+                if top <= neighbour_row < bottom and left <= neighbour_column < right:
+                    neighbour = neighbour_row * columns + neighbour_column
+                    if distances[neighbour] == -1 and not occupancy[neighbour]:
+                        distances[neighbour] = distance
+                        next_frontier.append(neighbour)
+        frontier = next_frontier
+    return distances
@@ -0,0 +1,111 @@
+# -*- encoding: utf-8 -*-
+"""Runs batches of pathfinding queries on several processes."""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+import os
+
+import components
+import maze
+
+# The graph of each worker process, created once by _init_worker
+_worker_graph = None
+# The connected areas of the worker's graph by movement mode, labelled by the first
+# chunk that needs them
+_worker_components = {}
+
+
+def _init_worker(rows: int, columns: int, occupancy: bytes) -> None:
+    """Builds the graph of a worker process from the occupancy of the main graph.
+
+    Args:
+        rows (int): The number of rows of the graph.
+        columns (int): The number of columns of the graph.
+        occupancy (bytes): The walls of the graph, one byte per cell.
+    """
+    global _worker_graph
+    _worker_graph = maze.ArrayGraph(rows, columns, occupancy=occupancy)
+    _worker_components.clear()
+
+
+def _solve_chunk(pairs: list, allow_diagonal: bool) -> list:
+    """Solves a chunk of queries on the graph of the worker process. The connected
+    areas of the graph are labelled once per worker and movement mode, not once per
+    chunk.
+
+    Args:
+        pairs (list): The (start, dest) pairs to solve.
+        allow_diagonal (bool): The flag that tells if diagonal movement is allowed.
+
+    Returns:
+        list: (start, dest, path) for every pair of the chunk.
+    """
+    index = _worker_components.get(allow_diagonal)
+    if index is None:
+        index = components.ComponentIndex(_worker_graph, allow_diagonal)
+        _worker_components[allow_diagonal] = index
+    return list(
+        _worker_graph.find_paths(
+            pairs, allow_diagonal, chunk_size=len(pairs), components=index
+        )
+    )
+
+
+def find_paths_parallel(
+    graph: maze.Graph,
+    pairs,
+    allow_diagonal=True,
+    workers: int = None,
+    chunk_size: int = 256,
+    ordered: bool = True,
+):
+    """Finds the shortest paths of many (start, dest) pairs with a pool of processes.
+
+    Every worker receives the walls of the graph once, when it starts, and then
+    solves chunks of pairs with Graph.find_paths. Only the pairs and the paths
+    travel between processes afterwards. At most two chunks per worker are
+    waiting at a time, so the pairs can come from a generator of any length.
+
+    Args:
+        graph (maze.Graph): The graph to search. Its walls are copied to the workers,
+        walls added after the call are not seen by them.
+        pairs: An iterable of ((start_row, start_column), (dest_row, dest_column)).
+        allow_diagonal (bool, optional): The flag that tells if
+        diagonal movement is allowed. Defaults to True.
+        workers (int, optional): The number of processes.
+        Defaults to None (the number of processors).
+        chunk_size (int, optional): The number of pairs sent to a worker at once.
+        Defaults to 256.
+        ordered (bool, optional): True to yield the results chunk by chunk in the order
+        the pairs were given, False to yield each chunk as soon as it is solved.
+        Defaults to True.
+
+    Yields:
+        tuple: (start, dest, path) for every pair. Within a chunk, the results are
+        grouped by destination like Graph.find_paths does.
+    """
+    pairs = iter(pairs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(graph.rows, graph.columns, bytes(graph.occupancy)),
+    ) as executor:
+        max_pending = 2 * workers
+        pending = []
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(islice(pairs, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_solve_chunk, chunk, allow_diagonal))
+            if not pending:
+                return
+            if ordered:
+                yield from pending.pop(0).result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()